@@ -1,8 +1,12 @@
+import argparse
 import curses
 from curses import newwin, wrapper
-import queue
 import time
 
+import numpy as np
+
+from maze_core import SOLVERS, read_maze_rows, solve, to_grid
+
 mazes = [
     [
         ["#", "O", "#", "#", "#", "#", "#", "#", "#"],
@@ -27,90 +31,94 @@ mazes = [
     ]
 ]
 
-# Function to print the maze in various stages as the algorithm tries to find the path
-def print_maze(maze, stdscr, path=[]):
-    GREEN = curses.color_pair(1)
-    RED = curses.color_pair(2)
-
-    for i, row in enumerate(maze):
-        for j, value in enumerate(row):
-            if (i, j) in path:
-                stdscr.addstr(i, j * 2, "X", RED)
-            else:
-                stdscr.addstr(i, j * 2, value, GREEN)
-
-
-def find_path(maze, stdscr):
-    start = "O"
-    end = "X"
-
-    start_pos = start_location(maze, start)
-
-    q = queue.Queue()
-    q.put((start_pos, [start_pos]))
-
-    visited = set()
-
-    while not q.empty():
-        current_pos, path = q.get()
-        row, col = current_pos
-
-        stdscr.clear()
-        print_maze(maze, stdscr, path)
-        stdscr.refresh()
-
-        if maze[row][col] == end:
-            return path
-
-        neighbours = find_neighbour(maze, row, col)
-
-        for neighbour in neighbours:
-            if neighbour in visited:
-                continue
-
-            r, c = neighbour
-
-            if maze[r][c] == "#":
-                continue
-
-            new_path = path + [neighbour]
-            q.put((neighbour, new_path))
-            visited.add(neighbour)
-
-        stdscr.getch()  # Wait for keypress to step through each iteration
-
-
-def find_neighbour(maze, row, col):
-    neighbours = []
-
-    if row > 0:
-        neighbours.append((row - 1, col))
-    if row < len(maze) - 1:
-        neighbours.append((row + 1, col))
-    if col > 0:
-        neighbours.append((row, col - 1))
-    if col < len(maze[0]) - 1:
-        neighbours.append((row, col + 1))
-
-    return neighbours
-
-
-# Function to find the start location in the maze
-def start_location(maze, start):
-    for i, row in enumerate(maze):
-        for j, value in enumerate(row):
-            if value == start:
-                return i, j
-    return None
-
-
-def main(stdscr):
+# What each cell currently shows; the renderer diffs these between frames
+SHOW_MAZE, SHOW_EXPLORED, SHOW_FRONTIER, SHOW_PATH = 0, 1, 2, 3
+
+
+class MazeRenderer:
+    """Curses view of a search that repaints only the cells that changed.
+
+    It is passed to the solver as on_event. The wanted state of every cell is
+    kept in a uint8 bitmap and compared with what was last painted, so a frame
+    costs O(changed cells) terminal writes instead of the whole maze. Frames
+    are paced to at most `fps` per second; with step=True each frame waits for
+    a keypress instead.
+    """
+
+    def __init__(self, stdscr, maze, fps=30, step=False):
+        self.stdscr = stdscr
+        self.chars = [list(row) for row in maze]
+        self.state = np.zeros((len(maze), len(maze[0])), dtype=np.uint8)
+        self.painted = np.full(self.state.shape, 255, dtype=np.uint8)  # forces a full first paint
+        self.frontier = None
+        self.frame_time = 1.0 / fps
+        self.step = step
+        self.last_frame = 0.0
+        self.styles = {
+            SHOW_EXPLORED: (".", curses.color_pair(3)),
+            SHOW_FRONTIER: ("o", curses.color_pair(2)),
+            SHOW_PATH: ("X", curses.color_pair(2)),
+        }
+
+    def __call__(self, kind, cells):
+        if kind == "frontier":
+            if self.frontier is not None:
+                self.state[self.frontier[:, 0], self.frontier[:, 1]] = SHOW_EXPLORED
+            self.state[cells[:, 0], cells[:, 1]] = SHOW_FRONTIER
+            self.frontier = cells
+        elif kind == "path":
+            self.state[cells[:, 0], cells[:, 1]] = SHOW_PATH
+        self.draw()
+        if self.step and kind == "frontier":
+            self.stdscr.getch()  # Wait for keypress to step through each search step
+
+    def draw(self):
+        if not self.step:
+            delay = self.last_frame + self.frame_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        self.last_frame = time.monotonic()
+
+        # Only the part of the maze that fits on the terminal is painted
+        height, width = self.stdscr.getmaxyx()
+        rows, cols = min(height, self.state.shape[0]), min((width - 1) // 2, self.state.shape[1])
+        view = self.state[:rows, :cols]
+        green = curses.color_pair(1)
+        for i, j in np.argwhere(view != self.painted[:rows, :cols]).tolist():
+            char, color = self.styles.get(int(view[i, j]), (self.chars[i][j], green))
+            try:
+                self.stdscr.addstr(i, j * 2, char, color)
+            except curses.error:
+                pass  # writing the bottom-right cell moves the cursor off screen
+        self.painted[:rows, :cols] = view
+        self.stdscr.refresh()
+
+
+def find_path(maze, stdscr, mode="bfs", fps=30, step=False):
+    # The search itself runs headless in maze_core; the renderer just consumes its events
+    stdscr.clear()
+    renderer = MazeRenderer(stdscr, maze, fps, step)
+    result = solve(to_grid(maze), mode, on_event=renderer)
+    return result.path
+
+
+def main(stdscr, mode="bfs", fps=30, step=False, mazes=mazes):
+    curses.curs_set(0)
     curses.init_pair(1, curses.COLOR_GREEN, curses.COLOR_BLACK)
     curses.init_pair(2, curses.COLOR_RED, curses.COLOR_BLACK)
+    curses.init_pair(3, curses.COLOR_YELLOW, curses.COLOR_BLACK)
 
     for maze in mazes:
-        find_path(maze, stdscr)
+        find_path(maze, stdscr, mode, fps, step)
         stdscr.getch()  # Wait for keypress to move to the next maze
 
 
-wrapper(main)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Visualize maze search in the terminal")
+    parser.add_argument("mode", nargs="?", default="bfs", choices=list(SOLVERS), help="Search algorithm")
+    parser.add_argument("--fps", type=float, default=30, help="Maximum frames per second")
+    parser.add_argument("--step", action="store_true", help="Wait for a keypress after every frame")
+    parser.add_argument("--maze", nargs="+", help="Maze text files to solve instead of the built-in ones")
+    args = parser.parse_args()
+    selected = [read_maze_rows(path) for path in args.maze] if args.maze else mazes
+    wrapper(main, args.mode, args.fps, args.step, selected)
@@ -0,0 +1,119 @@
+#Batch maze-solving benchmark: timing, nodes expanded and peak memory per algorithm
+
+import argparse
+import csv
+import os
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from maze_core import SOLVERS, load_maze, random_maze, solve
+
+# A maze produced on the fly by random_maze(); files are given by their path instead
+RandomMaze = namedtuple("RandomMaze", ["rows", "cols", "seed", "density"])
+
+FIELDS = ["maze", "mode", "rows", "cols", "path_length", "expanded", "seconds", "peak_mb"]
+
+
+def maze_files(directory):
+    """All maze text files in directory, in name order."""
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory)) if name.endswith(".txt")]
+
+
+def random_mazes(count, rows, cols, seed=0, density=0.3):
+    """count reproducible random maze specs, seeded seed, seed + 1, ..."""
+    return [RandomMaze(rows, cols, seed + i, density) for i in range(count)]
+
+
+def _maze_name(spec):
+    if isinstance(spec, RandomMaze):
+        return f"random-{spec.rows}x{spec.cols}-seed{spec.seed}"
+    return os.path.basename(spec)
+
+
+def _load(spec):
+    if isinstance(spec, RandomMaze):
+        return random_maze(spec.rows, spec.cols, spec.seed, spec.density)
+    return load_maze(spec)
+
+
+def _run(task):
+    """Solve one maze with one mode inside a worker; returns one CSV row."""
+    spec, mode, measure_memory = task
+    grid = _load(spec)
+
+    start = time.perf_counter()
+    result = solve(grid, mode)
+    seconds = time.perf_counter() - start
+
+    peak_mb = ""
+    if measure_memory:
+        # Separate traced run: tracemalloc slows allocation-heavy searches,
+        # so it must not skew the timing above.
+        tracemalloc.start()
+        solve(grid, mode)
+        peak_mb = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+        tracemalloc.stop()
+
+    return {
+        "maze": _maze_name(spec),
+        "mode": mode,
+        "rows": grid.shape[0],
+        "cols": grid.shape[1],
+        "path_length": len(result.path) - 1 if result.path is not None else "",
+        "expanded": result.expanded,
+        "seconds": round(seconds, 4),
+        "peak_mb": peak_mb,
+    }
+
+
+def solve_many(mazes, modes=tuple(SOLVERS), workers=None, measure_memory=True):
+    """Solve every maze with every mode across a process pool.
+
+    mazes holds file paths and/or RandomMaze specs; each worker loads or generates
+    its own maze, so grids are never pickled. Returns one dict per (maze, mode),
+    in input order.
+    """
+    tasks = [(spec, mode, measure_memory) for spec in mazes for mode in modes]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_run, tasks))
+
+
+def write_csv(rows, out):
+    writer = csv.DictWriter(out, fieldnames=FIELDS)
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark maze search algorithms")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--dir", help="Directory of maze .txt files")
+    source.add_argument("--random", type=int, metavar="COUNT", help="Number of random mazes to generate")
+    parser.add_argument("--size", default="512x512", help="Random maze size ROWSxCOLS")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first random maze")
+    parser.add_argument("--density", type=float, default=0.3, help="Wall density of random mazes")
+    parser.add_argument("--modes", nargs="+", default=list(SOLVERS), choices=list(SOLVERS))
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the traced peak-memory run")
+    parser.add_argument("-o", "--output", help="CSV file (default: stdout)")
+    args = parser.parse_args()
+
+    if args.dir:
+        mazes = maze_files(args.dir)
+    else:
+        rows, cols = map(int, args.size.lower().split("x"))
+        mazes = random_mazes(args.random, rows, cols, args.seed, args.density)
+
+    results = solve_many(mazes, args.modes, args.workers, not args.no_memory)
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            write_csv(results, f)
+    else:
+        write_csv(results, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,408 @@
+#Headless maze solver core (no curses needed)
+
+from array import array
+from collections import namedtuple
+from heapq import heappop, heappush
+
+import numpy as np
+
+# Cell codes of the uint8 grid
+OPEN = 0
+WALL = 1
+START = 2
+END = 3
+
+CHAR_CODES = {" ": OPEN, "#": WALL, "O": START, "X": END}
+
+# path is an (k, 2) array of (row, col) from start to end, or None if there is no path.
+# expanded counts the nodes taken off the frontier, so search modes can be compared.
+SearchResult = namedtuple("SearchResult", ["path", "expanded"])
+
+
+def to_grid(maze):
+    """Convert a maze given as rows of characters (lists or strings) to a uint8 grid."""
+    lookup = np.full(256, WALL, dtype=np.uint8)  # unknown characters act as walls
+    for char, code in CHAR_CODES.items():
+        lookup[ord(char)] = code
+    text = "".join("".join(row) for row in maze).encode("latin-1")
+    return lookup[np.frombuffer(text, dtype=np.uint8)].reshape(len(maze), -1)
+
+
+def read_maze_rows(path):
+    """Read a maze text file into a list of equal-length strings (short rows are padded with walls)."""
+    with open(path, encoding="latin-1") as f:
+        rows = f.read().splitlines()
+    while rows and not rows[-1].strip():
+        rows.pop()
+    width = max((len(row) for row in rows), default=0)
+    return [row.ljust(width, "#") for row in rows]
+
+
+def load_maze(path):
+    """Load a maze text file straight into a uint8 grid."""
+    return to_grid(read_maze_rows(path))
+
+
+def save_maze(grid, path):
+    """Write a uint8 grid back out in the text format read by load_maze."""
+    chars = np.zeros(256, dtype=np.uint8)
+    for char, code in CHAR_CODES.items():
+        chars[code] = ord(char)
+    lines = np.hstack([chars[grid], np.full((grid.shape[0], 1), ord("\n"), dtype=np.uint8)])
+    with open(path, "wb") as f:
+        f.write(lines.tobytes())
+
+
+def random_maze(rows, cols, seed=None, density=0.3):
+    """Random grid with START at the top-left, END at the bottom-right and ~density walls.
+
+    A random monotone staircase from START to END is carved out first, so every
+    generated maze is solvable.
+    """
+    rng = np.random.default_rng(seed)
+    grid = (rng.random((rows, cols)) < density).astype(np.uint8) * WALL
+    moves = np.zeros(rows + cols - 2, dtype=bool)
+    moves[:rows - 1] = True  # True = step down, False = step right
+    rng.shuffle(moves)
+    path_r = np.concatenate([[0], np.cumsum(moves)])
+    path_c = np.concatenate([[0], np.cumsum(~moves)])
+    grid[path_r, path_c] = OPEN
+    grid[0, 0] = START
+    grid[rows - 1, cols - 1] = END
+    return grid
+
+
+def _index_dtype(size):
+    return np.int32 if size < 2**31 else np.int64
+
+
+def _locate(flat, code):
+    hits = np.flatnonzero(flat == code)
+    if hits.size == 0:
+        raise ValueError(f"Maze has no cell with code {code}")
+    return int(hits[0])
+
+
+def _cells(indices, cols):
+    """Flat indices -> (k, 2) array of (row, col)."""
+    return np.column_stack(np.divmod(indices, cols))
+
+
+# Frontiers smaller than this are expanded cell by cell: in long corridors the
+# per-call overhead of the array version dominates.
+SMALL_FRONTIER = 64
+
+
+def _expand_small(frontier, parent, passable, rows, cols):
+    found = []
+    for node in frontier.tolist():
+        r, c = divmod(node, cols)
+        for ok, nbr in ((r > 0, node - cols), (r < rows - 1, node + cols), (c > 0, node - 1), (c < cols - 1, node + 1)):
+            if ok and passable[nbr] and parent[nbr] < 0:
+                parent[nbr] = node
+                found.append(nbr)
+    return np.array(found, dtype=parent.dtype)
+
+
+def _expand(frontier, parent, passable, rows, cols):
+    """Discover the unvisited open neighbours of frontier, record their parents, return them."""
+    if frontier.size < SMALL_FRONTIER:
+        return _expand_small(frontier, parent, passable, rows, cols)
+    r, c = np.divmod(frontier, cols)
+    nbrs, srcs = [], []
+    for ok, step in ((r > 0, -cols), (r < rows - 1, cols), (c > 0, -1), (c < cols - 1, 1)):
+        src = frontier[ok]
+        nbrs.append(src + step)
+        srcs.append(src)
+    nbr = np.concatenate(nbrs)
+    src = np.concatenate(srcs)
+    keep = passable[nbr] & (parent[nbr] < 0)
+    nbr, src = nbr[keep], src[keep]
+    # A cell reached from several sources keeps whichever write landed last;
+    # the (neighbour, source) pairs are unique, so this also deduplicates nbr.
+    parent[nbr] = src
+    return nbr[parent[nbr] == src]
+
+
+def _trace(parent, node, cols):
+    """Follow parent pointers from node back to the start; return the path as (row, col) pairs."""
+    path = [node]
+    while parent[node] != node:
+        node = int(parent[node])
+        path.append(node)
+    return _cells(np.array(path[::-1], dtype=np.int64), cols)
+
+
+def bfs(grid, on_event=None):
+    """Breadth-first search from the START cell to the nearest END cell.
+
+    The frontier is expanded one whole level at a time with array operations and
+    the path is rebuilt from a flat parent-pointer array, so memory is O(cells).
+    If given, on_event(kind, cells) is called with kind "frontier" for every level
+    and "path" for the result; cells is an (k, 2) array of (row, col).
+    """
+    rows, cols = grid.shape
+    flat = grid.ravel()
+    passable = flat != WALL
+    is_end = flat == END
+    start = _locate(flat, START)
+
+    parent = np.full(flat.size, -1, dtype=_index_dtype(flat.size))
+    parent[start] = start
+    frontier = np.array([start], dtype=parent.dtype)
+    expanded = 0
+    goal = start if is_end[start] else -1
+
+    while goal < 0 and frontier.size:
+        if on_event:
+            on_event("frontier", _cells(frontier, cols))
+        expanded += frontier.size
+        frontier = _expand(frontier, parent, passable, rows, cols)
+        hits = frontier[is_end[frontier]]
+        if hits.size:
+            goal = int(hits[0])
+
+    if goal < 0:
+        return SearchResult(None, expanded)
+    path = _trace(parent, goal, cols)
+    if on_event:
+        on_event("path", path)
+    return SearchResult(path, expanded)
+
+
+def bidirectional_bfs(grid, on_event=None):
+    """BFS growing from START and from every END at once, always expanding the smaller side.
+
+    Each side keeps its own parent and distance arrays; the search stops at the
+    first level where the two sides touch, taking the meeting cell that gives the
+    shortest total path.
+    """
+    rows, cols = grid.shape
+    flat = grid.ravel()
+    passable = flat != WALL
+    start = _locate(flat, START)
+    ends = np.flatnonzero(flat == END)
+    dtype = _index_dtype(flat.size)
+
+    parents, dists, frontiers = [], [], []
+    for sources in (np.array([start]), ends):
+        parent = np.full(flat.size, -1, dtype=dtype)
+        dist = np.full(flat.size, -1, dtype=dtype)
+        parent[sources] = sources
+        dist[sources] = 0
+        parents.append(parent)
+        dists.append(dist)
+        frontiers.append(sources.astype(dtype))
+    levels = [0, 0]
+    expanded = 0
+    meet = -1
+
+    while meet < 0 and frontiers[0].size and frontiers[1].size:
+        if on_event:
+            on_event("frontier", _cells(np.concatenate(frontiers), cols))
+        side = 0 if frontiers[0].size <= frontiers[1].size else 1
+        other = 1 - side
+        expanded += frontiers[side].size
+        found = _expand(frontiers[side], parents[side], passable, rows, cols)
+        levels[side] += 1
+        dists[side][found] = levels[side]
+        frontiers[side] = found
+        touching = found[dists[other][found] >= 0]
+        if touching.size:
+            meet = int(touching[np.argmin(dists[other][touching])])
+
+    if meet < 0:
+        return SearchResult(None, expanded)
+    to_start = _trace(parents[0], meet, cols)
+    to_end = _trace(parents[1], meet, cols)[::-1]
+    path = np.concatenate([to_start, to_end[1:]])
+    if on_event:
+        on_event("path", path)
+    return SearchResult(path, expanded)
+
+
+def astar(grid, on_event=None):
+    """A* search with the Manhattan-distance heuristic and a binary-heap open set.
+
+    Ties on f are broken towards the deeper node, which keeps expansions close to
+    the straight line on open grids. on_event gets one "frontier" call per
+    expanded cell.
+    """
+    rows, cols = grid.shape
+    flat = grid.ravel()
+    passable = (flat != WALL).tobytes()
+    is_end = (flat == END).tobytes()
+    start = _locate(flat, START)
+    targets = [divmod(int(e), cols) for e in np.flatnonzero(flat == END)]
+    if not targets:
+        return SearchResult(None, 0)
+
+    def h(node):
+        r, c = divmod(node, cols)
+        return min(abs(r - tr) + abs(c - tc) for tr, tc in targets)
+
+    typecode = "i" if flat.size < 2**31 else "q"
+    parent = array(typecode, [-1]) * flat.size
+    cost = array(typecode, [-1]) * flat.size
+    parent[start] = start
+    cost[start] = 0
+    open_set = [(h(start), 0, start)]
+    expanded = 0
+    goal = -1
+
+    while open_set:
+        _, neg_g, node = heappop(open_set)
+        g = -neg_g
+        if g > cost[node]:
+            continue  # stale entry, a shorter route was found after it was pushed
+        expanded += 1
+        if on_event:
+            on_event("frontier", _cells(np.array([node]), cols))
+        if is_end[node]:
+            goal = node
+            break
+        r, c = divmod(node, cols)
+        g += 1
+        for ok, nbr in ((r > 0, node - cols), (r < rows - 1, node + cols), (c > 0, node - 1), (c < cols - 1, node + 1)):
+            if ok and passable[nbr] and (cost[nbr] < 0 or g < cost[nbr]):
+                cost[nbr] = g
+                parent[nbr] = node
+                heappush(open_set, (g + h(nbr), -g, nbr))
+
+    if goal < 0:
+        return SearchResult(None, expanded)
+    path = _trace(parent, goal, cols)
+    if on_event:
+        on_event("path", path)
+    return SearchResult(path, expanded)
+
+
+def jump_point_search(grid, on_event=None):
+    """Jump Point Search adapted to 4-connected grids, on top of A*.
+
+    Among equally short paths only the "horizontal first" ones are searched: a
+    vertical run may turn sideways only where the cell diagonally behind is a
+    wall (a forced neighbour), while a horizontal run may turn up or down
+    anywhere. Straight runs are therefore skipped in one jump, and only the
+    cells where a turn can matter (jump points) enter the open set. Path
+    lengths equal BFS; expanded counts jump points, not cells.
+    """
+    rows, cols = grid.shape
+    flat = grid.ravel()
+    passable = (flat != WALL).tobytes()
+    is_end = (flat == END).tobytes()
+    start = _locate(flat, START)
+    targets = [divmod(int(e), cols) for e in np.flatnonzero(flat == END)]
+    if not targets:
+        return SearchResult(None, 0)
+
+    def free(r, c):
+        return 0 <= r < rows and 0 <= c < cols and passable[r * cols + c]
+
+    def forced(r, c, dr, dc):
+        # Moving vertically by dr into (r, c): sideways step dc is forced when the
+        # canonical route around the corner, (r - dr, c + dc), is blocked
+        return free(r, c + dc) and not free(r - dr, c + dc)
+
+    def jump_vertical(r, c, dr):
+        while True:
+            r += dr
+            if not free(r, c):
+                return None
+            node = r * cols + c
+            if is_end[node] or forced(r, c, dr, -1) or forced(r, c, dr, 1):
+                return node
+
+    def jump_horizontal(r, c, dc):
+        while True:
+            c += dc
+            if not free(r, c):
+                return None
+            node = r * cols + c
+            if is_end[node] or jump_vertical(r, c, -1) is not None or jump_vertical(r, c, 1) is not None:
+                return node
+
+    def h(node):
+        r, c = divmod(node, cols)
+        return min(abs(r - tr) + abs(c - tc) for tr, tc in targets)
+
+    # Directions: 0 up, 1 down, 2 left, 3 right; 4 marks the start (no incoming direction)
+    steps = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+    def successors(node, d):
+        r, c = divmod(node, cols)
+        if d == 4:
+            dirs = (0, 1, 2, 3)
+        elif d >= 2:
+            dirs = (d, 0, 1)
+        else:
+            dirs = (d,) + tuple(side for side, dc in ((2, -1), (3, 1)) if forced(r, c, steps[d][0], dc))
+        for nd in dirs:
+            dr, dc = steps[nd]
+            jp = jump_vertical(r, c, dr) if dc == 0 else jump_horizontal(r, c, dc)
+            if jp is not None:
+                yield jp, nd, abs(jp - node) // (cols if dc == 0 else 1)
+
+    cost = {(start, 4): 0}
+    parent = {(start, 4): None}
+    open_set = [(h(start), 0, start, 4)]
+    expanded = 0
+    goal = None
+
+    while open_set:
+        _, neg_g, node, d = heappop(open_set)
+        g = -neg_g
+        if g > cost[(node, d)]:
+            continue
+        expanded += 1
+        if on_event:
+            on_event("frontier", _cells(np.array([node]), cols))
+        if is_end[node]:
+            goal = (node, d)
+            break
+        for nxt, nd, dist in successors(node, d):
+            ng = g + dist
+            if ng < cost.get((nxt, nd), ng + 1):
+                cost[(nxt, nd)] = ng
+                parent[(nxt, nd)] = (node, d)
+                heappush(open_set, (ng + h(nxt), -ng, nxt, nd))
+
+    if goal is None:
+        return SearchResult(None, expanded)
+
+    # Jump points are joined by straight runs; fill in the cells between them
+    jumps = []
+    while goal is not None:
+        jumps.append(goal[0])
+        goal = parent[goal]
+    jumps.reverse()
+    path = [divmod(jumps[0], cols)]
+    for a, b in zip(jumps, jumps[1:]):
+        (r0, c0), (r1, c1) = divmod(a, cols), divmod(b, cols)
+        if r0 == r1:
+            step = 1 if c1 > c0 else -1
+            path.extend((r0, c) for c in range(c0 + step, c1 + step, step))
+        else:
+            step = 1 if r1 > r0 else -1
+            path.extend((r, c0) for r in range(r0 + step, r1 + step, step))
+    path = np.array(path, dtype=np.int64)
+    if on_event:
+        on_event("path", path)
+    return SearchResult(path, expanded)
+
+
+SOLVERS = {
+    "bfs": bfs,
+    "astar": astar,
+    "bidirectional": bidirectional_bfs,
+    "jps": jump_point_search,
+}
+
+
+def solve(grid, mode="bfs", on_event=None):
+    """Run the search selected by mode (one of SOLVERS) and return its SearchResult."""
+    try:
+        solver = SOLVERS[mode]
+    except KeyError:
+        raise ValueError(f"Unknown search mode {mode!r}; choose from {', '.join(SOLVERS)}") from None
+    return solver(grid, on_event=on_event)
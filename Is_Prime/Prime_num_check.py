@@ -1,34 +1,251 @@
+import argparse
+import os
+import sys
+from math import isqrt
+
+import numpy as np
+
+from prime_cache import PrimeTable
+from prime_sieve import is_prime_64, is_prime_batch, miller_rabin
+
 #Iteration Method
 
-def is_prime(number, divisor=2):
+def is_prime_recursive(number, divisor=2):
     if number <= 1:
         return False
     if divisor == number:
         return True
     if number % divisor == 0:
         return False
-    return is_prime(number, divisor + 1)
+    return is_prime_recursive(number, divisor + 1)
 
-num = int(input("Enter a number: "))
 
-if is_prime(num):
-    print(f"{num} is a prime number.")
-else:
-    print(f"{num} is not a prime number.")
-	
-	
 #Square root method
 
-def is_prime(number):
+def is_prime_sqrt(number):
     if number <= 1:
         return False
     for i in range(2, int(number**0.5) + 1): #This loop checks for factors from 2 up to the square root of the number. If any divisor divides the number evenly, it returns False.
         if number % i == 0:
             return False
     return True
-num = int(input("Enter a number: "))
 
-if is_prime(num):
-    print(f"{num} is a prime number.")
-else:
-    print(f"{num} is not a prime number.")
\ No newline at end of file
+
+#Miller-Rabin method
+
+# The small-prime wheel and deterministic Miller-Rabin core live in prime_sieve.py,
+# whose batch test falls back to them for scattered values.
+
+def _jacobi(a, n):
+    """Jacobi symbol (a/n) for odd n > 0."""
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+def strong_lucas(n):
+    """Strong Lucas probable-prime test of odd n > 2 (Selfridge parameters)."""
+    if isqrt(n) ** 2 == n:
+        return False  # no valid D exists for perfect squares
+
+    # First D in 5, -7, 9, -11, ... with (D/n) = -1
+    D = 5
+    while True:
+        j = _jacobi(D, n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != n:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+    P, Q = 1, (1 - D) // 4
+
+    d = n + 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    # Binary ladder for U_d, V_d and Q^d (mod n), starting from k = 1
+    U, V, Qk = 1, P, Q % n
+    for bit in bin(d)[3:]:
+        U = U * V % n
+        V = (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if bit == "1":
+            U, V = P * U + V, D * U + P * V
+            U = (U + n if U % 2 else U) // 2 % n
+            V = (V + n if V % 2 else V) // 2 % n
+            Qk = Qk * Q % n
+
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % n
+        if V == 0:
+            return True
+        Qk = Qk * Qk % n
+    return False
+
+
+# Optional on-disk prime bitmap (see prime_cache.py), set up by use_prime_table()
+_prime_table = None
+
+
+def use_prime_table(path, bound=None, verify=True):
+    """Answer is_prime(n) for n below the table bound with a single bit lookup.
+
+    The table at path is built (or grown) to cover bound, then memory-mapped.
+    verify=False skips the full-file checksum when reopening a trusted table.
+    """
+    global _prime_table
+    if _prime_table is not None:
+        _prime_table.close()
+    _prime_table = PrimeTable(path, bound, verify)
+    return _prime_table
+
+
+def is_prime(number):
+    """Fast primality test: wheel pre-filter, then Miller-Rabin or Baillie-PSW.
+
+    Exact for every number below 2^64. Larger numbers go through Baillie-PSW,
+    which has no known counterexample.
+    """
+    if number < 2:
+        return False
+    if _prime_table is not None and number < _prime_table.bound:
+        return number in _prime_table
+    if number < 1 << 64:
+        return is_prime_64(number)
+    # Baillie-PSW: base-2 strong test plus strong Lucas test
+    return miller_rabin(number, (2,)) and strong_lucas(number)
+
+
+#Streaming filter mode
+
+# Bytes read per chunk; ~400k numbers per vectorized batch for typical IDs
+CHUNK_BYTES = 1 << 22
+
+
+def classify(values):
+    """Vectorized is_prime over an int64 array."""
+    values = np.asarray(values, dtype=np.int64)
+    result = np.zeros(values.shape, dtype=bool)
+    todo = values >= 2
+    if _prime_table is not None:
+        in_table = todo & (values < _prime_table.bound)
+        result[in_table] = _prime_table.is_prime_batch(values[in_table])
+        todo &= ~in_table
+    rest = values[todo]
+    if rest.size == 0:
+        return result
+    # is_prime_batch sieves dense windows and runs Miller-Rabin on scattered values
+    result[todo] = is_prime_batch(rest)
+    return result
+
+
+def _classify_tokens(tokens):
+    """Classify a list of byte tokens; batches holding ints beyond int64 fall back to Python ints."""
+    try:
+        values = np.array(tokens).astype(np.int64)
+    except OverflowError:
+        return np.array([is_prime(int(tok)) for tok in tokens], dtype=bool)
+    return classify(values)
+
+
+def stream_filter(src, dst, primes_only=False, chunk_bytes=CHUNK_BYTES):
+    """Classify newline-delimited integers from the binary stream src, writing to dst.
+
+    Each output line is "<n> 1" for primes and "<n> 0" otherwise, or just the
+    primes when primes_only is set. Input is read in large chunks and each chunk
+    is classified as one NumPy batch.
+    """
+    tail = b""
+    while True:
+        chunk = src.read(chunk_bytes)
+        if not chunk:
+            break
+        chunk = tail + chunk
+        cut = chunk.rfind(b"\n") + 1
+        chunk, tail = chunk[:cut], chunk[cut:]
+        _write_batch(chunk.split(), dst, primes_only)
+    _write_batch(tail.split(), dst, primes_only)
+
+
+def _valid_tokens(tokens):
+    """Drop tokens that are not integers, reporting each one on stderr."""
+    valid = []
+    for tok in tokens:
+        try:
+            int(tok)
+        except ValueError:
+            print(f"Skipping non-integer input: {tok.decode(errors='replace')}", file=sys.stderr)
+        else:
+            valid.append(tok)
+    return valid
+
+
+def _write_batch(tokens, dst, primes_only):
+    if not tokens:
+        return
+    try:
+        flags = _classify_tokens(tokens)
+    except ValueError:
+        # Only batches that hold a bad token pay for checking them one by one
+        tokens = _valid_tokens(tokens)
+        if not tokens:
+            return
+        flags = _classify_tokens(tokens)
+    tokens = np.array(tokens)
+    if primes_only:
+        lines = np.char.add(tokens[flags], b"\n")
+    else:
+        lines = np.char.add(tokens, np.where(flags, b" 1\n", b" 0\n"))
+    dst.write(b"".join(lines.tolist()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check whether numbers are prime")
+    parser.add_argument("numbers", nargs="*", type=int, help="Numbers to check")
+    parser.add_argument("-f", "--file", help="Stream newline-delimited integers from a file ('-' for stdin)")
+    parser.add_argument("-p", "--primes-only", action="store_true", help="In stream mode, output only the primes")
+    parser.add_argument("--table", help="Prime bitmap file to build or reuse (see prime_cache.py)")
+    parser.add_argument("--table-bound", type=float, default=None, help="Bound for the prime bitmap, e.g. 1e9")
+    parser.add_argument("--no-verify", action="store_true", help="Skip the prime bitmap checksum (for a trusted table)")
+    args = parser.parse_args()
+
+    if args.table:
+        use_prime_table(args.table, int(args.table_bound) if args.table_bound else None, not args.no_verify)
+
+    if args.numbers and not args.file:
+        for num in args.numbers:
+            if is_prime(num):
+                print(f"{num} is a prime number.")
+            else:
+                print(f"{num} is not a prime number.")
+        return
+
+    # No numbers given: act as a filter over stdin (or the given file)
+    if args.file in (None, "-"):
+        stream_filter(sys.stdin.buffer, sys.stdout.buffer, args.primes_only)
+    else:
+        with open(args.file, "rb") as src:
+            stream_filter(src, sys.stdout.buffer, args.primes_only)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head): point stdout at devnull so the
+        # final flush at exit doesn't raise again, and stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
@@ -0,0 +1,150 @@
+#Persistent odd-only prime bitmap, opened with mmap
+
+import mmap
+import os
+import struct
+import zlib
+from math import isqrt
+
+import numpy as np
+
+from prime_sieve import SEGMENT_SIZE, simple_sieve, sieve_segment
+
+# File layout: header, then one bit per odd number (bit k of the stream is 2k + 1,
+# little-endian bit order inside each byte). The bound is always a multiple of 16,
+# so every byte covers 16 whole numbers and growing the table only appends bytes.
+MAGIC = b"PRIMEBM1"
+HEADER = struct.Struct("<8sQI4x")  # magic, bound, crc32 of the bitmap
+
+
+class PrimeTable:
+    """On-disk prime table for every n < bound.
+
+    The table is built once, reopened with mmap on later runs, validated against
+    the CRC32 in its header and extended in place when a larger bound is asked for.
+    Lookups only need read access, so a shared table can live on a read-only path;
+    the file is opened for writing only to build, rebuild or grow it. verify=False
+    skips the full-file CRC check for a table the caller already trusts.
+    """
+
+    def __init__(self, path, bound=None, verify=True):
+        self.path = path
+        self._mm = None
+        if not os.path.exists(path):
+            if bound is None:
+                raise FileNotFoundError(f"No prime table at {path}; pass a bound to build one")
+            self._write_header(0, 0, create=True)
+        stored_bound, crc = self._read_header(verify)
+        if stored_bound is None:
+            # Corrupt or truncated: it is only a cache, so rebuild from scratch
+            if bound is None:
+                raise ValueError(f"Prime table at {path} is corrupt; pass a bound to rebuild it")
+            self._write_header(0, 0, create=True)
+            stored_bound, crc = 0, 0
+        self.bound = stored_bound
+        self._crc = crc
+        if bound is not None and bound > self.bound:
+            self.grow(bound)  # maps the grown file
+        else:
+            self._open_map()
+
+    def _write_header(self, bound, crc, create=False):
+        with open(self.path, "wb" if create else "r+b") as f:
+            f.write(HEADER.pack(MAGIC, bound, crc))
+
+    def _read_header(self, verify):
+        """Return (bound, crc) from the header, or (None, None) if the file is invalid."""
+        with open(self.path, "rb") as f:
+            raw = f.read(HEADER.size)
+            if len(raw) < HEADER.size:
+                return None, None
+            magic, bound, crc = HEADER.unpack(raw)
+            expected = HEADER.size + bound // 16
+            size = os.fstat(f.fileno()).st_size
+            if magic != MAGIC or bound % 16 or size < expected:
+                return None, None
+            # Bytes past expected are leftovers from an interrupted grow(); they are
+            # ignored here and cut off by the next grow()
+            if verify:
+                actual = 0
+                remaining = expected - HEADER.size
+                while remaining:
+                    chunk = f.read(min(SEGMENT_SIZE, remaining))
+                    if not chunk:
+                        break
+                    actual = zlib.crc32(chunk, actual)
+                    remaining -= len(chunk)
+                if actual != crc:
+                    return None, None
+        return bound, crc
+
+    def _open_map(self):
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def grow(self, bound):
+        """Extend the table to cover every n < bound, sieving only the new part."""
+        bound = -(-bound // 16) * 16
+        if bound <= self.bound:
+            return
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        base_primes = simple_sieve(isqrt(bound - 1))
+        crc = self._crc
+        with open(self.path, "r+b") as f:
+            f.truncate(HEADER.size + self.bound // 16)  # drop leftovers from an interrupted grow()
+            f.seek(HEADER.size + self.bound // 16)
+            for lo in range(self.bound, bound, SEGMENT_SIZE):
+                hi = min(lo + SEGMENT_SIZE, bound)
+                flags = sieve_segment(lo, hi, base_primes)
+                packed = np.packbits(flags[1::2], bitorder="little").tobytes()
+                crc = zlib.crc32(packed, crc)
+                f.write(packed)
+            # Header last, so a crash mid-grow leaves the old table valid
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, bound, crc))
+        self.bound = bound
+        self._crc = crc
+        self._open_map()
+
+    def __contains__(self, n):
+        if not 0 <= n < self.bound:
+            raise ValueError(f"{n} is outside the table bound {self.bound}")
+        if n % 2 == 0:
+            return n == 2
+        k = n >> 1
+        return bool(self._mm[HEADER.size + (k >> 3)] >> (k & 7) & 1)
+
+    def is_prime_batch(self, values):
+        """Vectorized lookup; every value must lie in [0, bound)."""
+        values = np.asarray(values, dtype=np.int64)
+        if values.size and (values.min() < 0 or values.max() >= self.bound):
+            raise ValueError(f"values must lie in [0, {self.bound})")
+        if self.bound == 0:
+            return np.zeros(values.shape, dtype=bool)
+        bits = np.frombuffer(self._mm, dtype=np.uint8, offset=HEADER.size)
+        k = values >> 1
+        result = ((bits[k >> 3] >> (k & 7).astype(np.uint8)) & 1).astype(bool)
+        del bits
+        return np.where(values % 2 == 0, values == 2, result)
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+    import sys
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "primes.bin"
+    bound = int(float(sys.argv[2])) if len(sys.argv) > 2 else 10**8
+    with PrimeTable(path, bound) as table:
+        print(f"{path}: primes below {table.bound:,} ({os.path.getsize(path):,} bytes)")
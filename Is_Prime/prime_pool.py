@@ -0,0 +1,207 @@
+#Parallel prime counting and factorization over a process pool
+
+import argparse
+import os
+import random
+import sys
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+from math import gcd, isqrt
+
+from Prime_num_check import is_prime
+from prime_sieve import SEGMENT_SIZE, SMALL_PRIMES, primes_in_range
+
+# Numbers per range chunk handed to one worker (each worker sieves it segment by segment)
+RANGE_CHUNK = 16 * SEGMENT_SIZE
+# Integers per factorization task, so small numbers don't pay one IPC round trip each
+FACTOR_BATCH = 256
+
+
+def pollard_rho(n):
+    """Return a non-trivial factor of the odd composite n (Brent's variant)."""
+    while True:
+        y = random.randrange(1, n)
+        c = random.randrange(1, n)
+        m = 128
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            # The batched gcd overshot; step one at a time from the last checkpoint
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+
+def _iroot(n, k):
+    """Integer k-th root: the largest r with r**k <= n."""
+    if k == 2:
+        return isqrt(n)
+    r = 1 << -(-n.bit_length() // k)  # r**k >= n, then Newton steps down
+    while True:
+        s = ((k - 1) * r + n // r ** (k - 1)) // k
+        if s >= r:
+            return r
+        r = s
+
+
+def _perfect_power(n):
+    """Return (root, k) with root**k == n and k > 1, or None."""
+    for k in range(2, n.bit_length()):
+        root = _iroot(n, k)
+        if root < 2:
+            break
+        if root ** k == n:
+            return root, k
+    return None
+
+
+def factorize(n):
+    """Return the prime factors of n in ascending order, with multiplicity."""
+    factors = []
+    if n < 2:
+        return factors
+    for p in SMALL_PRIMES:
+        while n % p == 0:
+            factors.append(p)
+            n //= p
+    stack = [n] if n > 1 else []
+    while stack:
+        m = stack.pop()
+        if is_prime(m):
+            factors.append(m)
+            continue
+        # rho is slowest on prime powers, where it needs ~sqrt(p) steps to split p**k
+        power = _perfect_power(m)
+        if power:
+            root, k = power
+            stack.extend([root] * k)
+            continue
+        d = pollard_rho(m)
+        stack.extend((d, m // d))
+    return sorted(factors)
+
+
+def _count_chunk(bounds):
+    lo, hi = bounds
+    return sum(len(primes) for primes in primes_in_range(lo, hi))
+
+
+def _list_chunk(bounds):
+    lo, hi = bounds
+    return [int(p) for primes in primes_in_range(lo, hi) for p in primes]
+
+
+def _factor_batch(numbers):
+    return [(n, factorize(n)) for n in numbers]
+
+
+def _chunk_ranges(lo, hi, chunk):
+    for start in range(lo, hi, chunk):
+        yield start, min(start + chunk, hi)
+
+
+def _batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ordered_map(executor, fn, tasks, window):
+    """Like executor.map, but keeps at most `window` tasks in flight.
+
+    Results come back in input order, and an unbounded input (e.g. a huge file)
+    is never read into memory all at once.
+    """
+    pending = deque()
+    for task in tasks:
+        pending.append(executor.submit(fn, task))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def count_primes(lo, hi, workers=None, chunk=RANGE_CHUNK):
+    """Count the primes in [lo, hi) using a pool of worker processes."""
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return sum(ordered_map(executor, _count_chunk, _chunk_ranges(lo, hi, chunk), 2 * workers))
+
+
+def iter_primes(lo, hi, workers=None, chunk=RANGE_CHUNK):
+    """Yield the primes in [lo, hi) in ascending order, sieved in parallel."""
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for primes in ordered_map(executor, _list_chunk, _chunk_ranges(lo, hi, chunk), 2 * workers):
+            yield from primes
+
+
+def iter_factorizations(numbers, workers=None, batch=FACTOR_BATCH):
+    """Yield (n, factors) for each integer in numbers, in input order."""
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for results in ordered_map(executor, _factor_batch, _batched(numbers, batch), 4 * workers):
+            yield from results
+
+
+def _read_numbers(stream):
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield int(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel prime counting and factorization")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    count_p = sub.add_parser("count", help="Count primes in [lo, hi)")
+    count_p.add_argument("lo", type=int)
+    count_p.add_argument("hi", type=int)
+
+    list_p = sub.add_parser("list", help="Print primes in [lo, hi), one per line")
+    list_p.add_argument("lo", type=int)
+    list_p.add_argument("hi", type=int)
+
+    factor_p = sub.add_parser("factor", help="Factorize newline-delimited integers")
+    factor_p.add_argument("file", nargs="?", default="-", help="Input file (default: stdin)")
+
+    args = parser.parse_args()
+
+    if args.command == "count":
+        print(count_primes(args.lo, args.hi, args.workers))
+    elif args.command == "list":
+        out = sys.stdout
+        for p in iter_primes(args.lo, args.hi, args.workers):
+            out.write(f"{p}\n")
+    else:
+        # Only close the file if we opened it; stdin belongs to the caller
+        with (nullcontext(sys.stdin) if args.file == "-" else open(args.file)) as stream:
+            for n, factors in iter_factorizations(_read_numbers(stream), args.workers):
+                print(f"{n}: {' '.join(map(str, factors))}")
+
+
+if __name__ == "__main__":
+    main()
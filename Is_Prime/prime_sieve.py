@@ -0,0 +1,149 @@
+#Segmented Sieve of Eratosthenes (NumPy)
+
+from math import isqrt, log
+
+import numpy as np
+
+# Numbers sieved per segment. 1M booleans is 1 MB, which keeps every call
+# bounded in memory no matter how wide the requested range is.
+SEGMENT_SIZE = 1 << 20
+INT64_MAX = (1 << 63) - 1
+
+
+def simple_sieve(limit):
+    """Return all primes <= limit as an int64 array."""
+    if limit < 2:
+        return np.empty(0, dtype=np.int64)
+    flags = np.ones(limit + 1, dtype=bool)
+    flags[:2] = False
+    flags[4::2] = False
+    for p in range(3, isqrt(limit) + 1, 2):
+        if flags[p]:
+            flags[p * p::2 * p] = False
+    return np.flatnonzero(flags).astype(np.int64)
+
+
+def sieve_segment(lo, hi, base_primes):
+    """Return a boolean mask for [lo, hi): mask[i] is True when lo + i is prime.
+
+    base_primes must contain every prime up to sqrt(hi - 1).
+    """
+    flags = np.ones(hi - lo, dtype=bool)
+    if lo < 2:
+        flags[:2 - lo] = False  # 0 and 1 are not prime
+    for p in base_primes:
+        p = int(p)
+        if p * p >= hi:
+            break
+        start = max(p * p, -(-lo // p) * p)  # first multiple of p inside the segment
+        flags[start - lo::p] = False
+    return flags
+
+
+def primes_in_range(lo, hi, segment_size=SEGMENT_SIZE):
+    """Yield the primes in [lo, hi) one segment at a time, as int64 arrays."""
+    lo = max(lo, 0)
+    if hi <= lo:
+        return
+    base_primes = simple_sieve(isqrt(hi - 1))
+    for seg_lo in range(lo, hi, segment_size):
+        seg_hi = min(seg_lo + segment_size, hi)
+        flags = sieve_segment(seg_lo, seg_hi, base_primes)
+        yield np.flatnonzero(flags).astype(np.int64) + seg_lo
+
+
+# Small-prime wheel: most composites are rejected by one of these before any modular exponentiation.
+SMALL_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97)
+
+# Deterministic Miller-Rabin witnesses: four bases suffice below 3,215,031,751,
+# Jim Sinclair's seven-base set covers every n < 2^64.
+WITNESSES_32 = (2, 3, 5, 7)
+WITNESSES_64 = (2, 325, 9375, 28178, 450775, 9780504, 1795265022)
+
+
+def miller_rabin(n, bases):
+    """Strong probable-prime test of odd n > 2 against every base in bases."""
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in bases:
+        a %= n
+        if a == 0:
+            continue
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def is_prime_64(n):
+    """Exact primality of an int 2 <= n < 2^64: small-prime wheel, then deterministic Miller-Rabin."""
+    for p in SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+    if n < SMALL_PRIMES[-1] ** 2:
+        return True
+    return miller_rabin(n, WITNESSES_32 if n < 3215031751 else WITNESSES_64)
+
+
+def sieve_is_cheaper(count, lo, hi, segment_size=SEGMENT_SIZE):
+    """Rough cost model: segmented sieve of [lo, hi) vs. one Miller-Rabin per value, for count values."""
+    root = max(isqrt(hi), 2)
+    base_primes = root / log(root) + 1
+    span = hi - lo
+    segments = min(count, span // segment_size + 1)
+    sieve_cost = segments * base_primes * 0.5 + min(span, segments * segment_size) * 0.002  # microseconds
+    return sieve_cost < count * 5.0
+
+
+def is_prime_batch(values, segment_size=SEGMENT_SIZE):
+    """Return a boolean array telling which entries of values are prime.
+
+    The values are sorted once and walked in windows of at most segment_size,
+    each ending at the last query it holds. A window of dense queries is sieved;
+    one whose queries are too few to pay for a sieve (see sieve_is_cheaper) is
+    answered with deterministic Miller-Rabin instead.
+    """
+    values = np.asarray(values, dtype=np.int64)
+    flat = values.ravel()
+    result = np.zeros(flat.size, dtype=bool)
+    if flat.size == 0:
+        return result.reshape(values.shape)
+
+    order = np.argsort(flat, kind="stable")
+    sorted_vals = flat[order]
+    sorted_result = np.zeros(flat.size, dtype=bool)
+
+    base_primes = np.empty(0, dtype=np.int64)
+    base_limit = 1  # base_primes holds every prime <= base_limit
+    i = int(np.searchsorted(sorted_vals, 2))  # everything below 2 stays False
+    while i < flat.size:
+        seg_lo = int(sorted_vals[i])
+        j = int(np.searchsorted(sorted_vals, min(seg_lo + segment_size - 1, INT64_MAX), side="right"))
+        seg_hi = int(sorted_vals[j - 1]) + 1
+        if sieve_is_cheaper(j - i, seg_lo, seg_hi, segment_size):
+            if base_limit < isqrt(seg_hi - 1):
+                base_limit = max(isqrt(seg_hi - 1), 2 * base_limit)
+                base_primes = simple_sieve(base_limit)
+            flags = sieve_segment(seg_lo, seg_hi, base_primes)
+            sorted_result[i:j] = flags[sorted_vals[i:j] - seg_lo]
+        else:
+            sorted_result[i:j] = [is_prime_64(int(n)) for n in sorted_vals[i:j]]
+        i = j
+
+    result[order] = sorted_result
+    return result.reshape(values.shape)
+
+
+if __name__ == "__main__":
+    count = sum(len(chunk) for chunk in primes_in_range(0, 10**7))
+    print(f"Primes below 10^7: {count}")
+    print(is_prime_batch([1, 2, 97, 100, 7919, 10**9 + 7]))
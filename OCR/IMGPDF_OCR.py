@@ -1,4 +1,6 @@
 import os
+import queue
+import threading
 from PIL import Image
 import pytesseract
 import pandas as pd
@@ -14,6 +16,55 @@ from docx import Document
 
 # Note: Ensure Tesseract OCR is installed and added to PATH
 
+DETECTION_MODEL = "microsoft/table-transformer-detection"
+STRUCTURE_MODEL = "microsoft/table-transformer-structure-recognition"
+# Model weights are loaded from this folder only (no network). To fill it once, run with
+# IMGPDF_ALLOW_DOWNLOAD=1, which lets missing models be downloaded from the Hugging Face Hub.
+MODEL_CACHE_DIR = os.environ.get("IMGPDF_MODEL_DIR", os.path.join(os.path.expanduser("~"), ".cache", "imgpdf_ocr"))
+ALLOW_DOWNLOAD = os.environ.get("IMGPDF_ALLOW_DOWNLOAD") == "1"
+
+DETECTION_BATCH = 8  # Page images per detection forward pass
+STRUCTURE_BATCH = 16  # Table crops per structure-recognition forward pass
+PDF_DPI = 200  # Default rasterization resolution for PDF pages
+DPI_CHOICES = ['100', '150', '200', '300', '400']
+# Table OCR: one tesseract call per cell, or per row strip (words split into columns by position)
+OCR_MODES = {'Per cell': 'cell', 'Per row': 'row'}
+OCR_MODE = 'cell'
+BUCKET_PIXELS = 64  # Images whose resized sizes agree to this many pixels share a batch (little padding)
+
+# Page pipeline: worker threads per stage and the pages allowed to wait between two stages
+RASTER_WORKERS = 2  # pdftoppm runs as a separate process, so these overlap with everything else
+DETECT_WORKERS = 1  # torch already spreads one batch over TORCH_THREADS
+OCR_WORKERS = max(1, (os.cpu_count() or 1) // 2)  # each waits on its own tesseract process
+# CPU inference threads; by default the cores left over by the OCR workers' tesseract processes
+TORCH_THREADS = int(os.environ.get("IMGPDF_TORCH_THREADS", max(1, (os.cpu_count() or 1) - OCR_WORKERS)))
+QUEUE_SIZE = 2 * DETECTION_BATCH
+POLL_MS = 100  # How often the GUI checks for progress
+_DONE = object()  # End-of-stream marker passed between stages
+
+# Process-wide registry: each model is loaded once and shared by every page and file
+_models = {}
+_models_lock = threading.Lock()
+
+def get_model(name):
+    """Return (processor, model) for a table-transformer checkpoint, loading it on first use."""
+    with _models_lock:
+        if name not in _models:
+            if not _models:
+                # Set once, on the first load, rather than as a side effect of importing this script
+                torch.set_num_threads(TORCH_THREADS)
+            try:
+                model = TableTransformerForObjectDetection.from_pretrained(name, cache_dir=MODEL_CACHE_DIR, local_files_only=True)
+            except OSError:
+                if not ALLOW_DOWNLOAD:
+                    raise OSError(f"Model {name} is not in the model cache {MODEL_CACHE_DIR}. Set IMGPDF_MODEL_DIR "
+                                  f"to a folder that has it, or run once with IMGPDF_ALLOW_DOWNLOAD=1 to download it.") from None
+                print(f"Downloading {name} into {MODEL_CACHE_DIR}...")
+                model = TableTransformerForObjectDetection.from_pretrained(name, cache_dir=MODEL_CACHE_DIR)
+            model.eval()
+            _models[name] = (DetrImageProcessor(), model)
+        return _models[name]
+
 def get_pdf_page_count(pdf_path):
     with open(pdf_path, 'rb') as f:
         reader = PyPDF2.PdfReader(f)
@@ -28,6 +79,10 @@ def populate_page_ranges(num_pages):
             ranges.append(f"{i}-{end}")
     return ranges
 
+def rasterize_page(pdf_path, page, dpi=PDF_DPI):
+    """Render one PDF page to a PIL image."""
+    return convert_from_path(pdf_path, dpi=dpi, first_page=page, last_page=page)[0]
+
 def select_file():
     file_path = filedialog.askopenfilename(filetypes=[("PDF or Image files", "*.pdf *.jpg *.jpeg *.png")])
     if file_path:
@@ -41,158 +96,283 @@ def select_file():
             combo_pages['values'] = ['1']
             combo_pages.current(0)
 
-def extract_table_from_image(image_path):
-    image = Image.open(image_path).convert("RGB")
+def preprocess_image(image):
     # Preprocess the image for better OCR and detection
-    image_np = np.array(image)
+    image_np = np.array(image.convert("RGB"))
     gray = cv2.cvtColor(image_np, cv2.COLOR_RGB2GRAY)
     thresh = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
-    image = Image.fromarray(thresh).convert("RGB")
-    text = pytesseract.image_to_string(image)
-
-    # Table Detection
-    detection_processor = DetrImageProcessor()
-    detection_model = TableTransformerForObjectDetection.from_pretrained(
-        "microsoft/table-transformer-detection"
-    )
-
-    inputs = detection_processor(images=image, return_tensors="pt")
-    outputs = detection_model(**inputs)
-    target_sizes = torch.tensor([image.size[::-1]])
-    detection_results = detection_processor.post_process_object_detection(outputs, threshold=0.7, target_sizes=target_sizes)[0]
-
-    tables = []
-    label_dict = detection_model.config.id2label
-    for score, label, box in zip(detection_results["scores"], detection_results["labels"], detection_results["boxes"]):
-        if label_dict[label.item()] == 'table' and score > 0.7:
-            crop_box = (box[0].item(), box[1].item(), box[2].item(), box[3].item())
-            cropped_table = image.crop(crop_box)
-
-            # Table Structure Recognition
-            structure_processor = DetrImageProcessor()
-            structure_model = TableTransformerForObjectDetection.from_pretrained(
-                "microsoft/table-transformer-structure-recognition"
-            )
+    return Image.fromarray(thresh).convert("RGB")
+
+def _bucket_key(image, processor):
+    # Size the processor will resize the image to, rounded to BUCKET_PIXELS
+    size = processor.size if isinstance(processor.size, dict) else {}
+    shortest, longest = size.get("shortest_edge", 800), size.get("longest_edge", 1333)
+    width, height = image.size
+    scale = min(shortest / min(width, height), longest / max(width, height))
+    return round(height * scale / BUCKET_PIXELS), round(width * scale / BUCKET_PIXELS)
+
+def run_batched(name, images, threshold, batch_size):
+    """Run a table-transformer over PIL images in size-bucketed batches.
+
+    Returns the post-processed detections of every image (in input order) and the model's label names.
+    """
+    if not images:
+        return [], {}
+    processor, model = get_model(name)
+    buckets = {}
+    for idx, image in enumerate(images):
+        buckets.setdefault(_bucket_key(image, processor), []).append(idx)
+
+    results = [None] * len(images)
+    for indices in buckets.values():
+        for start in range(0, len(indices), batch_size):
+            batch = indices[start:start + batch_size]
+            inputs = processor(images=[images[i] for i in batch], return_tensors="pt")
+            with torch.inference_mode():
+                outputs = model(**inputs)
+            target_sizes = torch.tensor([images[i].size[::-1] for i in batch])
+            detections = processor.post_process_object_detection(outputs, threshold=threshold, target_sizes=target_sizes)
+            for i, detection in zip(batch, detections):
+                results[i] = detection
+    return results, model.config.id2label
+
+def detect_tables(images):
+    """Table bounding boxes (xmin, ymin, xmax, ymax) found on each image."""
+    results, label_dict = run_batched(DETECTION_MODEL, images, 0.7, DETECTION_BATCH)
+    boxes = []
+    for result in results:
+        boxes.append([tuple(box.tolist()) for score, label, box in zip(result["scores"], result["labels"], result["boxes"])
+                      if label_dict[label.item()] == 'table' and score > 0.7])
+    return boxes
+
+def recognize_structure(crops):
+    """(columns, rows, has_header) of each cropped table; columns sorted by xmin, rows by ymin."""
+    results, label_dict = run_batched(STRUCTURE_MODEL, crops, 0.5, STRUCTURE_BATCH)
+    structures = []
+    for result in results:
+        names = [label_dict[lbl.item()] for lbl in result['labels']]
+        boxes = [box.tolist() for box in result['boxes']]
+
+        # Get columns
+        columns = sorted((box for box, name in zip(boxes, names) if name == 'table column'), key=lambda x: x[0])
+
+        # Get rows including header
+        rows = sorted((box for box, name in zip(boxes, names) if name in ['table row', 'table column header']), key=lambda x: x[1])
+
+        structures.append((columns, rows, 'table column header' in names))
+    return structures
+
+def _prepare_crop(cropped_table, box, small=None):
+    # Re-threshold a piece of the table and upsample it 3x if it is small (by default: narrower
+    # than 100 px or shorter than 20 px); returns (image, scale)
+    cell_np = np.array(cropped_table.crop(box))
+    if len(cell_np.shape) == 2:
+        cell_np = cv2.cvtColor(cell_np, cv2.COLOR_GRAY2RGB)
+    cell_gray = cv2.cvtColor(cell_np, cv2.COLOR_RGB2GRAY)
+    cell_thresh = cv2.adaptiveThreshold(cell_gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
+    cell_pil = Image.fromarray(cell_thresh)
+    # Resize if small
+    if small is None:
+        small = cell_pil.width < 100 or cell_pil.height < 20
+    if small:
+        return cell_pil.resize((cell_pil.width * 3, cell_pil.height * 3)), 3
+    return cell_pil, 1
+
+def ocr_cell(cropped_table, cell_box):
+    cell_pil, _ = _prepare_crop(cropped_table, cell_box)
+    return pytesseract.image_to_string(cell_pil, config='--psm 7').strip()
+
+def ocr_row(cropped_table, row_box, columns):
+    """Read a whole row strip with one tesseract call and split its words into one text per column.
+
+    Each word goes to the column whose x-range holds its centre, or the nearest column if none does.
+    The strip gets the same re-threshold as a cell, and the 3x upsample whenever the row's cells
+    would have had it in 'cell' mode.
+    """
+    narrowest = min(column[2] - column[0] for column in columns)
+    small = narrowest < 100 or row_box[3] - row_box[1] < 20
+    strip, scale = _prepare_crop(cropped_table, (0, row_box[1], cropped_table.size[0], row_box[3]), small)
+    data = pytesseract.image_to_data(strip, config='--psm 6', output_type=pytesseract.Output.DICT)
+    words = [(data['left'][k], data['width'][k], data['text'][k].strip()) for k in range(len(data['text']))
+             if data['text'][k].strip()]
+    cells = [[] for _ in columns]
+    if words:
+        left = np.array([column[0] for column in columns])
+        right = np.array([column[2] for column in columns])
+        centers = np.array([(x + w / 2) / scale for x, w, _ in words])
+        # Distance from each word centre to each column's x-range, 0 inside it
+        distance = np.maximum(left[np.newaxis, :] - centers[:, np.newaxis], centers[:, np.newaxis] - right[np.newaxis, :])
+        for (_, _, text), column in zip(words, np.argmin(np.maximum(distance, 0), axis=1)):
+            cells[column].append(text)  # image_to_data lists words in reading order
+    return [' '.join(cell) for cell in cells]
+
+def table_to_dataframe(cropped_table, columns, rows, has_header, ocr_mode=OCR_MODE):
+    """OCR a table into a DataFrame, one tesseract call per cell ('cell') or per row ('row')."""
+    if not rows or not columns:
+        return None
+
+    if has_header:
+        header_row = rows[0]
+        data_rows = rows[1:]
+    else:
+        header_row = None
+        data_rows = rows
 
-            structure_inputs = structure_processor(images=cropped_table, return_tensors="pt")
-            structure_outputs = structure_model(**structure_inputs)
-            structure_target_sizes = torch.tensor([cropped_table.size[::-1]])
-            structure_results = structure_processor.post_process_object_detection(structure_outputs, threshold=0.5, target_sizes=structure_target_sizes)[0]
+    if ocr_mode == 'row':
+        if header_row:
+            column_names = [text if text else f"Column {i+1}" for i, text in enumerate(ocr_row(cropped_table, header_row, columns))]
+        else:
+            column_names = [f"Column {i+1}" for i in range(len(columns))]
+        data = [ocr_row(cropped_table, row, columns) for row in data_rows]
+        return pd.DataFrame(data, columns=column_names)
 
-            structure_label_dict = structure_model.config.id2label
+    # Extract column names
+    column_names = []
+    for i in range(len(columns)):
+        cell_ymin = header_row[1] if header_row else 0
+        cell_ymax = header_row[3] if header_row else cropped_table.size[1]
+        cell_text = ocr_cell(cropped_table, (columns[i][0], cell_ymin, columns[i][2], cell_ymax))
+        column_names.append(cell_text if cell_text else f"Column {i+1}")
 
-            # Get columns
-            columns = [box.tolist() for idx, lbl in enumerate(structure_results['labels']) if structure_label_dict[lbl.item()] == 'table column']
-            columns.sort(key=lambda x: x[0])  # sort by xmin
+    # Extract data rows
+    data = []
+    for row in data_rows:
+        data.append([ocr_cell(cropped_table, (column[0], row[1], column[2], row[3])) for column in columns])
 
-            # Get rows including header
-            rows = [box.tolist() for idx, lbl in enumerate(structure_results['labels']) if structure_label_dict[lbl.item()] in ['table row', 'table column header']]
-            rows.sort(key=lambda x: x[1])  # sort by ymin
+    return pd.DataFrame(data, columns=column_names)
 
-            if not rows or not columns:
-                continue
+def locate_tables(images):
+    """Preprocess images and find their tables; returns (image, [(cropped_table, structure), ...]) per image.
 
-            has_header = any(structure_label_dict[lbl.item()] == 'table column header' for lbl in structure_results['labels'])
+    Detection and structure recognition run batched over all of the images.
+    """
+    images = [preprocess_image(image) for image in images]
 
-            if has_header:
-                header_row = rows[0]
-                data_rows = rows[1:]
-            else:
-                header_row = None
-                data_rows = rows
-
-            # Extract column names
-            column_names = []
-            for i in range(len(columns)):
-                cell_xmin = columns[i][0]
-                cell_xmax = columns[i][2]
-                cell_ymin = header_row[1] if header_row else 0
-                cell_ymax = header_row[3] if header_row else cropped_table.size[1]
-                cell_img = cropped_table.crop((cell_xmin, cell_ymin, cell_xmax, cell_ymax))
-                cell_np = np.array(cell_img)
-                if len(cell_np.shape) == 2:
-                    cell_np = cv2.cvtColor(cell_np, cv2.COLOR_GRAY2RGB)
-                cell_gray = cv2.cvtColor(cell_np, cv2.COLOR_RGB2GRAY)
-                cell_thresh = cv2.adaptiveThreshold(cell_gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
-                cell_pil = Image.fromarray(cell_thresh)
-                # Resize if small
-                if cell_pil.width < 100 or cell_pil.height < 20:
-                    cell_pil = cell_pil.resize((cell_pil.width * 3, cell_pil.height * 3))
-                cell_text = pytesseract.image_to_string(cell_pil, config='--psm 7').strip()
-                column_names.append(cell_text if cell_text else f"Column {i+1}")
-
-            # Extract data rows
-            data = []
-            for row in data_rows:
-                row_data = []
-                for i in range(len(columns)):
-                    cell_xmin = columns[i][0]
-                    cell_xmax = columns[i][2]
-                    cell_ymin = row[1]
-                    cell_ymax = row[3]
-                    cell_img = cropped_table.crop((cell_xmin, cell_ymin, cell_xmax, cell_ymax))
-                    cell_np = np.array(cell_img)
-                    if len(cell_np.shape) == 2:
-                        cell_np = cv2.cvtColor(cell_np, cv2.COLOR_GRAY2RGB)
-                    cell_gray = cv2.cvtColor(cell_np, cv2.COLOR_RGB2GRAY)
-                    cell_thresh = cv2.adaptiveThreshold(cell_gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
-                    cell_pil = Image.fromarray(cell_thresh)
-                    # Resize if small
-                    if cell_pil.width < 100 or cell_pil.height < 20:
-                        cell_pil = cell_pil.resize((cell_pil.width * 3, cell_pil.height * 3))
-                    cell_text = pytesseract.image_to_string(cell_pil, config='--psm 7').strip()
-                    row_data.append(cell_text)
-                data.append(row_data)
-
-            df = pd.DataFrame(data, columns=column_names)
+    # Table Detection
+    crops, owners = [], []
+    for idx, (image, boxes) in enumerate(zip(images, detect_tables(images))):
+        for box in boxes:
+            crops.append(image.crop(box))
+            owners.append(idx)
+
+    # Table Structure Recognition, for the tables of all images at once
+    located = [(image, []) for image in images]
+    for idx, cropped_table, structure in zip(owners, crops, recognize_structure(crops)):
+        located[idx][1].append((cropped_table, structure))
+    return located
+
+def read_page(image, located_tables, ocr_mode=OCR_MODE):
+    """OCR a preprocessed image and its located tables into (tables, text)."""
+    text = pytesseract.image_to_string(image)
+    tables = []
+    for cropped_table, structure in located_tables:
+        df = table_to_dataframe(cropped_table, *structure, ocr_mode)
+        if df is not None:
             tables.append(df)
-
     return tables, text
 
-def process_file():
-    input_file = entry_file_path.get()
-    if not input_file:
-        messagebox.showerror("Error", "Please select a file.")
-        return
-
-    page_range = combo_pages.get()
-    output_type = combo_output.get()
-
-    if not page_range or not output_type:
-        messagebox.showerror("Error", "Please select page range and output type.")
-        return
-
-    base_name = os.path.basename(input_file).rsplit('.', 1)[0]
-    desktop = os.path.join(os.path.expanduser("~"), "OneDrive", "Desktop")
-    all_tables = []
-    all_text = ''
-
-    if input_file.lower().endswith('.pdf'):
-        num_pages = get_pdf_page_count(input_file)
-        if page_range == 'All':
-            start, end = 1, num_pages
-        else:
-            start, end = map(int, page_range.split('-'))
-        page_imgs = convert_from_path(input_file, first_page=start, last_page=end)
-        for idx, page_img in enumerate(page_imgs, start=start):
-            temp_path = os.path.join(desktop, f"temp_page_{idx}.jpg")
-            page_img.save(temp_path, 'JPEG')
-            tables, text = extract_table_from_image(temp_path)
-            all_tables.extend([(f"Page {idx} Table {j+1}", df) for j, df in enumerate(tables)])
-            all_text += text + '\n\n'
-            os.remove(temp_path)
-    else:
-        tables, text = extract_table_from_image(input_file)
-        all_tables.extend([(f"Table {j+1}", df) for j, df in enumerate(tables)])
-        all_text = text
-
+def extract_tables_from_images(images, ocr_mode=OCR_MODE):
+    """Return (tables, text) for every PIL image."""
+    return [read_page(image, located_tables, ocr_mode) for image, located_tables in locate_tables(images)]
+
+def extract_table_from_image(image_path, ocr_mode=OCR_MODE):
+    return extract_tables_from_images([Image.open(image_path)], ocr_mode)[0]
+
+class _StageQueue(queue.Queue):
+    def __init__(self, maxsize, consumers):
+        super().__init__(maxsize)
+        self.consumers = consumers  # worker threads reading from this queue
+
+def _run_stage(workers, inbox, outbox, work, batch_size, stop, failures):
+    """Start workers threads calling work(items, outbox) on up to batch_size items from inbox.
+
+    Each worker exits on a _DONE marker; once all have, one _DONE per worker of the next stage
+    (given by outbox.consumers) is sent on. After stop is set, items are drained without work.
+    """
+    def worker():
+        while True:
+            items = [inbox.get()]
+            while len(items) < batch_size and items[-1] is not _DONE:
+                try:
+                    items.append(inbox.get_nowait())
+                except queue.Empty:
+                    break
+            done = items[-1] is _DONE
+            if done:
+                items.pop()
+            if items and not stop.is_set():
+                try:
+                    work(items, outbox)
+                except Exception as e:
+                    stop.set()
+                    failures.put(e)
+            if done:
+                return
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+
+    def close():
+        for thread in threads:
+            thread.join()
+        for _ in range(outbox.consumers):
+            outbox.put(_DONE)
+    threading.Thread(target=close, daemon=True).start()
+
+def pipeline_pages(pdf_path, start, end, dpi=PDF_DPI, ocr_mode=OCR_MODE):
+    """Yield (page number, tables, text) for PDF pages start..end, in page order.
+
+    Pages flow through three stages of worker threads connected by bounded queues:
+    rasterization (RASTER_WORKERS), table detection and structure recognition (DETECT_WORKERS,
+    batched), and OCR (OCR_WORKERS). At most a few QUEUE_SIZE pages are in memory at a time.
+    """
+    stop = threading.Event()
+    failures = queue.Queue()
+    page_numbers = _StageQueue(0, RASTER_WORKERS)
+    rasterized = _StageQueue(QUEUE_SIZE, DETECT_WORKERS)
+    located = _StageQueue(QUEUE_SIZE, OCR_WORKERS)
+    results = _StageQueue(0, 1)
+
+    def rasterize(items, outbox):
+        for page in items:
+            outbox.put((page, rasterize_page(pdf_path, page, dpi)))
+
+    def detect(items, outbox):
+        for (page, _), (image, located_tables) in zip(items, locate_tables([image for _, image in items])):
+            outbox.put((page, image, located_tables))
+
+    def ocr(items, outbox):
+        for page, image, located_tables in items:
+            outbox.put((page,) + read_page(image, located_tables, ocr_mode))
+
+    for page in range(start, end + 1):
+        page_numbers.put(page)
+    for _ in range(RASTER_WORKERS):
+        page_numbers.put(_DONE)
+    _run_stage(RASTER_WORKERS, page_numbers, rasterized, rasterize, 1, stop, failures)
+    _run_stage(DETECT_WORKERS, rasterized, located, detect, DETECTION_BATCH, stop, failures)
+    _run_stage(OCR_WORKERS, located, results, ocr, 1, stop, failures)
+
+    # Workers finish pages out of order; hold early ones back until their turn
+    pending = {}
+    next_page = start
+    try:
+        while next_page <= end:
+            item = results.get()
+            if item is _DONE:
+                raise failures.get()
+            pending[item[0]] = item[1:]
+            while next_page in pending:
+                tables, text = pending.pop(next_page)
+                yield next_page, tables, text
+                next_page += 1
+    finally:
+        stop.set()  # lets the workers drain their queues and exit if we stop early
+
+def write_output(output, output_type, all_tables, all_text):
     has_tables = len(all_tables) > 0
 
-    ext_map = {'Excel': '.xlsx', 'TXT': '.txt', 'DOC': '.docx'}
-    output_ext = ext_map[output_type]
-    range_str = page_range.replace('-', '_') if page_range != 'All' else 'all'
-    output = os.path.join(desktop, f"{base_name}_{range_str}{output_ext}")
-
     if output_type == 'Excel':
         writer = pd.ExcelWriter(output, engine='openpyxl')
         text_df = pd.DataFrame({'Extracted Text': all_text.split('\n')})
@@ -220,7 +400,87 @@ def process_file():
                         table_doc.cell(row_idx + 1, j).text = str(val) if pd.notnull(val) else ''
         doc.save(output)
 
-    messagebox.showinfo("Success", f"File saved to {output}")
+def process_file():
+    input_file = entry_file_path.get()
+    if not input_file:
+        messagebox.showerror("Error", "Please select a file.")
+        return
+
+    page_range = combo_pages.get()
+    output_type = combo_output.get()
+    dpi = int(combo_dpi.get())
+    ocr_mode = OCR_MODES[combo_ocr.get()]
+
+    if not page_range or not output_type:
+        messagebox.showerror("Error", "Please select page range and output type.")
+        return
+
+    base_name = os.path.basename(input_file).rsplit('.', 1)[0]
+    desktop = os.path.join(os.path.expanduser("~"), "OneDrive", "Desktop")
+    ext_map = {'Excel': '.xlsx', 'TXT': '.txt', 'DOC': '.docx'}
+    output_ext = ext_map[output_type]
+    range_str = page_range.replace('-', '_') if page_range != 'All' else 'all'
+    output = os.path.join(desktop, f"{base_name}_{range_str}{output_ext}")
+
+    if input_file.lower().endswith('.pdf'):
+        num_pages = get_pdf_page_count(input_file)
+        if page_range == 'All':
+            start, end = 1, num_pages
+        else:
+            start, end = map(int, page_range.split('-'))
+        total = end - start + 1
+    else:
+        start = end = None
+        total = 1
+
+    # The extraction runs on a background thread; poll_progress() picks up its messages
+    button_process.config(state=tk.DISABLED)
+    progress.config(maximum=total, value=0)
+    status_var.set(f"Processing 0/{total} pages...")
+    threading.Thread(target=_process_worker, args=(input_file, start, end, dpi, ocr_mode, output, output_type, total),
+                     daemon=True).start()
+    root.after(POLL_MS, poll_progress)
+
+def _process_worker(input_file, start, end, dpi, ocr_mode, output, output_type, total):
+    # Runs off the Tk thread: it only talks to the GUI through progress_queue
+    try:
+        all_tables = []
+        all_text = ''
+        if start is not None:
+            for idx, tables, text in pipeline_pages(input_file, start, end, dpi, ocr_mode):
+                all_tables.extend([(f"Page {idx} Table {j+1}", df) for j, df in enumerate(tables)])
+                all_text += text + '\n\n'
+                progress_queue.put(("progress", idx - start + 1, total))
+        else:
+            tables, text = extract_table_from_image(input_file, ocr_mode)
+            all_tables.extend([(f"Table {j+1}", df) for j, df in enumerate(tables)])
+            all_text = text
+            progress_queue.put(("progress", 1, total))
+        write_output(output, output_type, all_tables, all_text)
+        progress_queue.put(("done", output))
+    except Exception as e:
+        progress_queue.put(("error", str(e)))
+
+def poll_progress():
+    while True:
+        try:
+            message = progress_queue.get_nowait()
+        except queue.Empty:
+            root.after(POLL_MS, poll_progress)
+            return
+        if message[0] == "progress":
+            _, done, total = message
+            progress.config(value=done)
+            status_var.set(f"Processing {done}/{total} pages...")
+        else:
+            button_process.config(state=tk.NORMAL)
+            if message[0] == "done":
+                status_var.set("Done")
+                messagebox.showinfo("Success", f"File saved to {message[1]}")
+            else:
+                status_var.set("Failed")
+                messagebox.showerror("Error", message[1])
+            return
 
 def exit_app():
     root.quit()
@@ -228,7 +488,7 @@ def exit_app():
 # GUI
 root = tk.Tk()
 root.title("Data Extractor GUI")
-root.geometry("500x300")
+root.geometry("500x470")
 
 entry_file_path = tk.StringVar()
 
@@ -243,7 +503,24 @@ combo_output = ttk.Combobox(root, values=['Excel', 'TXT', 'DOC'], state="readonl
 combo_output.grid(row=2, column=1, padx=10)
 combo_output.current(0)
 
-tk.Button(root, text="Process", command=process_file).grid(row=3, column=0, pady=20, padx=20)
-tk.Button(root, text="Exit", command=exit_app).grid(row=3, column=1, pady=20)
+tk.Label(root, text="PDF Resolution (DPI):").grid(row=3, column=0, pady=10)
+combo_dpi = ttk.Combobox(root, values=DPI_CHOICES, state="readonly")
+combo_dpi.grid(row=3, column=1, padx=10)
+combo_dpi.set(str(PDF_DPI))
+
+tk.Label(root, text="Table OCR:").grid(row=4, column=0, pady=10)
+combo_ocr = ttk.Combobox(root, values=list(OCR_MODES), state="readonly")
+combo_ocr.grid(row=4, column=1, padx=10)
+combo_ocr.set(next(label for label, mode in OCR_MODES.items() if mode == OCR_MODE))
+
+button_process = tk.Button(root, text="Process", command=process_file)
+button_process.grid(row=5, column=0, pady=20, padx=20)
+tk.Button(root, text="Exit", command=exit_app).grid(row=5, column=1, pady=20)
+
+progress = ttk.Progressbar(root, orient="horizontal", length=400, mode="determinate")
+progress.grid(row=6, column=0, columnspan=2, padx=20)
+status_var = tk.StringVar(value="Ready")
+tk.Label(root, textvariable=status_var).grid(row=7, column=0, columnspan=2, pady=5)
+progress_queue = queue.Queue()
 
 root.mainloop()
\ No newline at end of file
@@ -11,6 +11,13 @@ import re
 import json
 
 class TableExtractor:
+    # Cell crops are stacked into montages (at most MONTAGE_MAX_HEIGHT pixels tall, MONTAGE_GAP
+    # pixels of white between cells) and each montage is read with a single tesseract call,
+    # instead of launching tesseract once per cell
+    MONTAGE_GAP = 24
+    MONTAGE_MARGIN = 10
+    MONTAGE_MAX_HEIGHT = 8000
+
     def __init__(self, tesseract_path=None):
         """
         Initialize the TableExtractor
@@ -91,11 +98,11 @@ class TableExtractor:
             # Sort cells by position (top to bottom, left to right)
             cells.sort(key=lambda cell: (cell[1], cell[0]))
             
-            # Extract text from each cell
+            # Extract text from all cells in one OCR pass per montage
+            crops = [enhanced[y:y+h, x:x+w] for x, y, w, h in cells]
+            texts = self._ocr_cells_batched(crops)
             cell_texts = []
-            for x, y, w, h in cells:
-                cell_img = enhanced[y:y+h, x:x+w]
-                text = pytesseract.image_to_string(cell_img, config=self.ocr_config).strip()
+            for (x, y, w, h), text in zip(cells, texts):
                 cell_texts.append({
                     'x': x, 'y': y, 'w': w, 'h': h,
                     'text': text
@@ -107,6 +114,61 @@ class TableExtractor:
             print(f"Error in OpenCV cell extraction: {e}")
             return []
     
+    def _build_montages(self, crops):
+        """Stack grayscale crops vertically into white montages.
+        
+        Returns a list of (montage, slots), where slots holds (crop index, top, bottom) for
+        every crop placed in that montage.
+        """
+        montages = []
+        batch, height, width = [], self.MONTAGE_MARGIN, 0
+        for index, crop in enumerate(crops):
+            h, w = crop.shape[:2]
+            if batch and height + h + self.MONTAGE_MARGIN > self.MONTAGE_MAX_HEIGHT:
+                montages.append(self._paste_montage(batch, height, width))
+                batch, height, width = [], self.MONTAGE_MARGIN, 0
+            batch.append((index, crop, height))
+            height += h + self.MONTAGE_GAP
+            width = max(width, w)
+        if batch:
+            montages.append(self._paste_montage(batch, height, width))
+        return montages
+    
+    def _paste_montage(self, batch, height, width):
+        montage = np.full((height - self.MONTAGE_GAP + self.MONTAGE_MARGIN, width + 2 * self.MONTAGE_MARGIN), 255, dtype=np.uint8)
+        slots = []
+        for index, crop, top in batch:
+            h, w = crop.shape[:2]
+            montage[top:top + h, self.MONTAGE_MARGIN:self.MONTAGE_MARGIN + w] = crop
+            slots.append((index, top, top + h))
+        return montage, slots
+    
+    def _ocr_cells_batched(self, crops):
+        """OCR many cell crops with one tesseract call per montage; returns one text per crop"""
+        texts = [''] * len(crops)
+        for montage, slots in self._build_montages(crops):
+            data = pytesseract.image_to_data(montage, config=self.ocr_config, output_type=pytesseract.Output.DICT)
+            
+            # Map every word back to the slot containing its vertical centre
+            tops = np.array([top for _, top, _ in slots])
+            lines = {}
+            for i, word in enumerate(data['text']):
+                word = word.strip()
+                if not word:
+                    continue
+                centre = data['top'][i] + data['height'][i] / 2
+                slot = np.searchsorted(tops, centre, side='right') - 1
+                if slot < 0 or centre > slots[slot][2] + self.MONTAGE_GAP / 2:
+                    continue
+                line_key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+                lines.setdefault(slots[slot][0], {}).setdefault(line_key, []).append((data['left'][i], data['top'][i], word))
+            
+            # Rebuild each cell's text line by line (top to bottom), words left to right
+            for index, cell_lines in lines.items():
+                ordered = sorted(cell_lines.values(), key=lambda words: min(top for _, top, _ in words))
+                texts[index] = '\n'.join(' '.join(word for _, _, word in sorted(words)) for words in ordered)
+        return texts
+    
     def _group_cells_into_table(self, cells):
         """Group cells into rows and columns"""
         if not cells:
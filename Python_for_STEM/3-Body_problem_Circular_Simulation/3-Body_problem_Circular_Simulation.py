@@ -3,10 +3,14 @@ import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 from scipy.integrate import odeint
 import tkinter as tk
+from tkinter import filedialog, simpledialog
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
+# The state layout and force kernel are shared with the Interactive N-Body Simulation
+from nbody_shared import G, derivatives, pack_state, unpack_state
+from block_timestep import integrate_block
+
 # Constants
-G = 6.67430e-11  # Gravitational constant in m^3 kg^-1 s^-2
 AU = 1.495978707e11  # 1 AU in meters
 
 class NBodySimulation:
@@ -24,7 +28,7 @@ class NBodySimulation:
         # Number of bodies
         self.n = 3  # Central body + 2 orbiting bodies
         self.masses = [1.989e30, 5.972e24, 1.898e27]  # Sun, Earth, Jupiter (kg)
-        self.positions = np.array([[0.0, 0.0], [1.0, 0.0], [5.2, 0.0]])  # AU
+        self.positions = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [5.2, 0.0, 0.0]])  # AU (x, y, z)
         self.velocities = self.calculate_initial_velocities()
 
         # GUI Elements
@@ -69,6 +73,7 @@ class NBodySimulation:
         self.mass_sliders = []
         self.pos_x_entries = []
         self.pos_y_entries = []
+        self.pos_z_entries = []
 
         for i in range(self.n):
             # Mass Slider
@@ -95,6 +100,21 @@ class NBodySimulation:
             pos_y_entry.pack()
             self.pos_y_entries.append(pos_y_entry)
 
+            pos_z_label = tk.Label(self.input_frame, text=f"Initial z {i+1} (AU):")
+            pos_z_label.pack()
+            pos_z_entry = tk.Entry(self.input_frame)
+            pos_z_entry.insert(0, str(self.positions[i, 2]))
+            pos_z_entry.pack()
+            self.pos_z_entries.append(pos_z_entry)
+
+        # Integrator: per-body power-of-two block timesteps (Hermite) or one global adaptive step (odeint)
+        self.block_steps_var = tk.BooleanVar(value=False)
+        self.block_steps_check = tk.Checkbutton(self.input_frame, text="Per-body block timesteps",
+                                                variable=self.block_steps_var)
+        self.block_steps_check.pack()
+        self.steps_var = tk.StringVar()  # force evaluations per body of the last block-timestep run
+        tk.Label(self.input_frame, textvariable=self.steps_var).pack()
+
         # Buttons
         self.update_button = tk.Button(self.input_frame, text="Update Simulation", 
                                      command=self.update_simulation)
@@ -108,6 +128,11 @@ class NBodySimulation:
                                       command=self.predict_positions)
         self.predict_button.pack()
 
+        # Results of a parameter sweep (see ensemble.py)
+        self.load_member_button = tk.Button(self.input_frame, text="Load Sweep Member...",
+                                          command=self.load_sweep_member)
+        self.load_member_button.pack()
+
         # Speed Control Buttons
         self.speed_up_button = tk.Button(self.input_frame, text="Speed Up", 
                                        command=self.speed_up)
@@ -123,11 +148,11 @@ class NBodySimulation:
         self.exit_button.pack()
 
     def calculate_initial_velocities(self):
-        """Calculate initial velocities for circular orbits."""
-        velocities = np.zeros((self.n, 2))
+        """Calculate initial velocities for circular orbits (parallel to the x-y plane)."""
+        velocities = np.zeros((self.n, 3))
         central_mass = self.masses[0]
         for i in range(1, self.n):
-            r = np.sqrt(self.positions[i, 0]**2 + self.positions[i, 1]**2) * AU
+            r = np.linalg.norm(self.positions[i]) * AU
             v = np.sqrt(G * central_mass / r)  # Circular orbit velocity
             angle = np.arctan2(self.positions[i, 1], self.positions[i, 0])
             velocities[i, 0] = -v * np.sin(angle) / AU
@@ -136,10 +161,8 @@ class NBodySimulation:
 
     def calculate_total_time(self):
         """Calculate total simulation time based on the farthest body's orbital period."""
-        farthest_body = np.argmax([np.sqrt(p[0]**2 + p[1]**2) 
-                                 for p in self.positions[1:]]) + 1
-        r = np.sqrt(self.positions[farthest_body, 0]**2 + 
-                   self.positions[farthest_body, 1]**2) * AU
+        farthest_body = np.argmax(np.linalg.norm(self.positions[1:], axis=1)) + 1
+        r = np.linalg.norm(self.positions[farthest_body]) * AU
         T = 2 * np.pi * np.sqrt(r**3 / (G * self.masses[0]))
         return T  # Time for one full orbit
 
@@ -150,31 +173,59 @@ class NBodySimulation:
             self.masses[i] = float(self.mass_sliders[i].get())
             self.positions[i, 0] = float(self.pos_x_entries[i].get())
             self.positions[i, 1] = float(self.pos_y_entries[i].get())
+            self.positions[i, 2] = float(self.pos_z_entries[i].get())
 
         # Recalculate velocities and total time
         self.velocities = self.calculate_initial_velocities()
         self.total_time = self.calculate_total_time()
         self.times = np.linspace(0, self.total_time, self.num_frames)
 
-        # Update scatter plot
-        self.scatter.set_offsets(self.positions)
+        # Update scatter plot (x-y projection)
+        self.scatter.set_offsets(self.positions[:, :2])
         self.canvas.draw()
 
-    def derivatives(self, state, t):
-        """Compute derivatives for the ODE solver."""
-        positions = state[:2*self.n].reshape(self.n, 2)
-        velocities = state[2*self.n:].reshape(self.n, 2)
-        accelerations = np.zeros_like(positions)
+    def load_sweep_member(self):
+        """Load the masses and positions of one member of a sweep results CSV and animate it."""
+        try:
+            from ensemble import load_member
+        except ImportError as e:
+            print(f"Sweep support needs pandas. Install with: pip install pandas ({e})")
+            return
+        path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
+        if not path:
+            return
+        member = simpledialog.askinteger("Sweep Member", "Member number:", parent=self.root, minvalue=0)
+        if member is None:
+            return
+        try:
+            masses, positions = load_member(path, member)
+        except (KeyError, ValueError) as e:
+            print(f"Could not load member {member} from {path}: {e}")
+            return
+        if len(masses) != self.n:
+            print(f"Member {member} has {len(masses)} bodies; this simulation has {self.n}")
+            return
+
         for i in range(self.n):
-            for j in range(self.n):
-                if i != j:
-                    dx = positions[j, 0] - positions[i, 0]
-                    dy = positions[j, 1] - positions[i, 1]
-                    r = np.sqrt(dx**2 + dy**2)
-                    if r > 0:
-                        accelerations[i, 0] += G * self.masses[j] * dx / r**3
-                        accelerations[i, 1] += G * self.masses[j] * dy / r**3
-        return np.concatenate([velocities.flatten(), accelerations.flatten()])
+            self.mass_sliders[i].set(masses[i])
+            for entry, value in zip((self.pos_x_entries[i], self.pos_y_entries[i], self.pos_z_entries[i]), positions[i]):
+                entry.delete(0, tk.END)
+                entry.insert(0, str(value))
+        self.update_simulation()
+        self.start_animation()
+
+    def derivatives(self, state, t):
+        """Compute derivatives for the ODE solver (shared 3D kernel, see nbody_state.py)."""
+        return derivatives(state, t, self.masses, self.n)
+
+    def solve(self, initial_state, times):
+        """Integrate to the given times with the selected integrator."""
+        if not self.block_steps_var.get():
+            self.steps_var.set("")
+            return odeint(self.derivatives, initial_state, times)
+        sol, info = integrate_block(initial_state, times, self.masses, full_output=True)
+        self.steps_var.set("Force evaluations: " + ", ".join(f"{i+1}: {s}" for i, s in enumerate(info["steps"])))
+        return sol
 
     def start_animation(self):
         """Start or restart the animation."""
@@ -182,15 +233,13 @@ class NBodySimulation:
             self.ani.event_source.stop()
 
         # Initial state in meters
-        initial_positions_m = self.positions * AU
-        initial_velocities_m = self.velocities * AU
-        initial_state = np.concatenate([initial_positions_m.flatten(), 
-                                      initial_velocities_m.flatten()])
+        initial_state = pack_state(self.positions * AU, self.velocities * AU)
 
         # Solve ODE
-        sol = odeint(self.derivatives, initial_state, self.times)
-        x_all = sol[:, 0:2*self.n:2] / AU
-        y_all = sol[:, 1:2*self.n:2] / AU
+        sol = self.solve(initial_state, self.times)
+        positions_all = sol[:, :3*self.n].reshape(-1, self.n, 3) / AU
+        x_all = positions_all[:, :, 0]
+        y_all = positions_all[:, :, 1]
 
         # Animation function
         def update(frame):
@@ -205,24 +254,20 @@ class NBodySimulation:
     def predict_positions(self):
         """Predict positions at a future time."""
         t_future = float(input("Enter future time (seconds): "))
-        initial_state = np.concatenate([self.positions.flatten() * AU, 
-                                      self.velocities.flatten() * AU])
-        sol = odeint(self.derivatives, initial_state, [0, t_future])
-        positions_m = sol[-1, :2*self.n].reshape(self.n, 2)
-        positions_au = positions_m / AU
+        initial_state = pack_state(self.positions * AU, self.velocities * AU)
+        sol = self.solve(initial_state, [0, t_future])
+        positions_au = unpack_state(sol[-1], self.n)[0] / AU
 
         # Output positions
         print(f"\nPositions at t = {t_future} seconds:")
         for i in range(self.n):
-            print(f"Body {i+1}: x = {positions_au[i,0]:.2f} AU, y = {positions_au[i,1]:.2f} AU")
+            print(f"Body {i+1}: x = {positions_au[i,0]:.2f} AU, y = {positions_au[i,1]:.2f} AU, z = {positions_au[i,2]:.2f} AU")
 
         # Output relative distances
         print("\nRelative distances:")
         for i in range(self.n):
             for j in range(i+1, self.n):
-                dx = positions_au[i,0] - positions_au[j,0]
-                dy = positions_au[i,1] - positions_au[j,1]
-                dist = np.sqrt(dx**2 + dy**2)
+                dist = np.linalg.norm(positions_au[i] - positions_au[j])
                 print(f"Distance between Body {i+1} and Body {j+1}: {dist:.2f} AU")
 
     def speed_up(self):
@@ -0,0 +1,141 @@
+#Headless parameter sweeps over the 3-Body simulation, run in parallel across cores
+
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from nbody_shared import G, energy_drift, pack_state
+from block_timestep import ETA, integrate_block
+
+AU = 1.495978707e11  # 1 AU in meters
+YEAR = 3.15576e7  # Julian year in seconds
+
+# Defaults of the GUI: Sun, Earth, Jupiter on the x axis
+DEFAULT_MASSES = (1.989e30, 5.972e24, 1.898e27)
+DEFAULT_POSITIONS = ((0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (5.2, 0.0, 0.0))
+
+# A body counts as ejected once it is this many times farther from the centre of mass than the
+# farthest body started, and unbound from the rest of the system
+EJECTION_FACTOR = 10.0
+FRAMES = 2000  # Output frames per member; metrics are sampled on these
+
+
+def circular_velocities(positions, masses):
+    """Velocities (m/s) for circular orbits of every body but the first around the first one.
+
+    positions are (n, 3) in AU; orbits are parallel to the x-y plane.
+    """
+    positions = np.asarray(positions, dtype=float)
+    velocities = np.zeros_like(positions)
+    for i in range(1, len(positions)):
+        r = np.linalg.norm(positions[i]) * AU
+        v = np.sqrt(G * masses[0] / r)
+        angle = np.arctan2(positions[i, 1], positions[i, 0])
+        velocities[i, 0] = -v * np.sin(angle)
+        velocities[i, 1] = v * np.cos(angle)
+    return velocities
+
+
+def orbit_time(positions, masses):
+    """Orbital period (s) of the body farthest from the first one."""
+    positions = np.asarray(positions, dtype=float)
+    r = np.max(np.linalg.norm(positions[1:], axis=1)) * AU
+    return 2 * np.pi * np.sqrt(r**3 / (G * masses[0]))
+
+
+def stability_metrics(sol, times, masses):
+    """Ejection time (s, NaN if none), minimum pairwise separation (AU) and maximum relative energy error."""
+    masses = np.asarray(masses, dtype=float)
+    n = len(masses)
+    dim = sol.shape[1] // (2 * n)
+    pos = sol[:, :dim*n].reshape(len(sol), n, dim)
+    vel = sol[:, dim*n:].reshape(len(sol), n, dim)
+
+    d = pos[:, :, np.newaxis, :] - pos[:, np.newaxis, :, :]
+    dist = np.linalg.norm(d, axis=-1)
+    dist[:, np.arange(n), np.arange(n)] = np.inf
+    min_separation = dist.min() / AU
+
+    total = masses.sum()
+    com = np.einsum("j,tjk->tk", masses, pos) / total
+    com_vel = np.einsum("j,tjk->tk", masses, vel) / total
+    r = np.linalg.norm(pos - com[:, np.newaxis, :], axis=-1)
+    v2 = np.sum((vel - com_vel[:, np.newaxis, :]) ** 2, axis=-1)
+    unbound = v2 / 2 - G * (total - masses) / np.maximum(r, 1.0) > 0
+    ejected = (r > EJECTION_FACTOR * r[0].max()) & unbound
+    hits = np.flatnonzero(ejected.any(axis=1))
+    ejection_time = times[hits[0]] if hits.size else np.nan
+
+    return ejection_time, min_separation, energy_drift(sol, masses).max()
+
+
+def run_member(member):
+    """Integrate one sweep member (a dict with masses, positions, years, optional frames and eta) and return its result row."""
+    masses = np.asarray(member["masses"], dtype=float)
+    positions = np.asarray(member["positions"], dtype=float)
+    times = np.linspace(0, member["years"] * YEAR, member.get("frames", FRAMES))
+    initial_state = pack_state(positions * AU, circular_velocities(positions, masses))
+    sol, info = integrate_block(initial_state, times, masses, eta=member.get("eta", ETA), full_output=True)
+    ejection_time, min_separation, energy_error = stability_metrics(sol, times, masses)
+
+    row = {"member": member["member"]}
+    for i, m in enumerate(masses):
+        row[f"m{i+1}"] = m
+    for i, p in enumerate(positions):
+        row[f"x{i+1}"], row[f"y{i+1}"], row[f"z{i+1}"] = p
+    row.update(ejection_time=ejection_time, min_separation=min_separation, energy_error=energy_error,
+               steps=int(info["steps"].sum()))
+    return row
+
+
+def sweep(masses, positions, years, frames=FRAMES, workers=None, eta=ETA):
+    """Run every combination of a mass set and a position set; returns one DataFrame row per member.
+
+    masses is a sequence of per-body mass vectors (kg), positions a sequence of (n, 3) position
+    arrays (AU); bodies start on circular orbits around the first body, as in the GUI. eta is the
+    block-timestep accuracy parameter: smaller values give more accurate (and slower) members.
+    """
+    members = [{"member": k, "masses": m, "positions": p, "years": years, "frames": frames, "eta": eta}
+               for k, (m, p) in enumerate(itertools.product(masses, positions))]
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        rows = list(executor.map(run_member, members, chunksize=max(1, len(members) // (4 * workers))))
+    return pd.DataFrame(rows).set_index("member")
+
+
+def load_member(results, member):
+    """Return (masses, positions (n, 3) in AU) of one member of a sweep DataFrame or CSV file."""
+    if isinstance(results, (str, os.PathLike)):
+        results = pd.read_csv(results, index_col="member")
+    row = results.loc[member]
+    n = sum(1 for column in results.columns if column.startswith("m") and column[1:].isdigit())
+    masses = [float(row[f"m{i+1}"]) for i in range(n)]
+    positions = np.array([[row[f"x{i+1}"], row[f"y{i+1}"], row[f"z{i+1}"]] for i in range(n)], dtype=float)
+    return masses, positions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep Jupiter's mass and distance in the Sun-Earth-Jupiter system")
+    parser.add_argument("--jupiter-mass", type=float, nargs="+", default=[DEFAULT_MASSES[2]], help="Masses (kg)")
+    parser.add_argument("--jupiter-x", type=float, nargs="+", default=[DEFAULT_POSITIONS[2][0]], help="Distances (AU)")
+    parser.add_argument("--years", type=float, default=100.0, help="Simulated time per member")
+    parser.add_argument("--frames", type=int, default=FRAMES, help="Output frames per member")
+    parser.add_argument("--eta", type=float, default=ETA, help="Block-timestep accuracy parameter (smaller is more accurate)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("-o", "--out", help="Write the results to this CSV file")
+    args = parser.parse_args()
+
+    masses = [(DEFAULT_MASSES[0], DEFAULT_MASSES[1], mj) for mj in args.jupiter_mass]
+    positions = [(DEFAULT_POSITIONS[0], DEFAULT_POSITIONS[1], (x, 0.0, 0.0)) for x in args.jupiter_x]
+    results = sweep(masses, positions, args.years, args.frames, args.workers, args.eta)
+    if args.out:
+        results.to_csv(args.out)
+    print(results[["m3", "x3", "ejection_time", "min_separation", "energy_error"]].to_string())
+
+
+if __name__ == "__main__":
+    main()
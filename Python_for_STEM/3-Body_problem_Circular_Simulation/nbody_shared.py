@@ -0,0 +1,13 @@
+import os
+import sys
+
+# The state layout, force kernel and integrators live in ../Interactive_N-Body_Simulation. That
+# folder is not a package (its name has a hyphen), so this is the one place that puts it on
+# sys.path; the scripts here import what they need from this module.
+
+NBODY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Interactive_N-Body_Simulation")
+if NBODY_DIR not in sys.path:
+    sys.path.insert(0, NBODY_DIR)
+
+from nbody_state import G, derivatives, pack_state, unpack_state  # noqa: E402
+from integrators import energy_drift  # noqa: E402
@@ -1,39 +1,116 @@
+import queue
+import threading
 import tkinter as tk
-from tkinter import ttk
+from tkinter import filedialog, ttk
 import numpy as np
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
-from scipy.integrate import odeint
-import matplotlib.animation as animation
+from scipy.integrate import odeint, solve_ivp
 
-# Constants
-G = 6.67430e-11  # Gravitational constant in m^3 kg^-1 s^-2
+from barnes_hut import accelerations as barnes_hut_accelerations
+from checkpoints import CheckpointStore, trajectory_key
+from integrators import energy, energy_drift, integrate_fixed
+from nbody_state import G, accelerations, derivatives, state_dim, unpack_state
+from orbit_renderer import OrbitRenderer, frame_stride
+from trajectory_io import TrajectoryWriter
+
+# Constants (G comes with the shared force kernel in nbody_state.py)
 AU = 1.495978707e11  # 1 AU in meters
-C = 3.0e8  # Speed of light in m/s
-
-# Derivatives function for n-body system
-def derivatives(state, t, m, n, use_gr, gr_factor):
-    positions = state[:2*n]
-    velocities = state[2*n:]
-    accelerations = np.zeros(2*n)
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                dx = positions[2*j] - positions[2*i]
-                dy = positions[2*j+1] - positions[2*i+1]
-                r = np.sqrt(dx**2 + dy**2)
-                if r > 0:
-                    # Newtonian acceleration
-                    a_newton = G * m[j] / r**3
-                    accelerations[2*i] += a_newton * dx
-                    accelerations[2*i+1] += a_newton * dy
-                    # GR correction (simplified post-Newtonian term)
-                    if use_gr and gr_factor > 0:
-                        gamma = gr_factor * (G * m[j]) / (C**2 * r)
-                        a_gr = a_newton * gamma
-                        accelerations[2*i] += a_gr * dx
-                        accelerations[2*i+1] += a_gr * dy
-    return np.concatenate([velocities, accelerations])
+
+# Plummer softening length (m) added to every pairwise distance; 0 keeps pure Newtonian forces
+SOFTENING = 0.0
+
+# Largest system the GUI offers input fields for (bigger systems are loaded from a file)
+MAX_BODIES = 500
+
+# From this many bodies on, forces come from the Barnes-Hut tree code instead of the O(N^2) kernel
+BARNES_HUT_THRESHOLD = 1000
+THETA = 0.5  # Barnes-Hut opening angle: smaller is more accurate, larger is faster
+
+# Bodies listed individually in the prediction output
+MAX_LISTED = 20
+
+# Background solving: the solve starts once the inputs have been quiet for DEBOUNCE_MS, and the
+# worker hands frames to the GUI in blocks of STREAM_CHUNK, which the GUI collects every POLL_MS
+DEBOUNCE_MS = 300
+STREAM_CHUNK = 25
+POLL_MS = 50
+FRAME_INTERVAL_MS = 50  # Animation tick (20 frames per second)
+
+# Integrators offered in the GUI: LSODA adapts its step, the symplectic ones use the fixed time step
+INTEGRATOR_CHOICES = {"odeint (adaptive)": "odeint", "Leapfrog": "leapfrog", "Yoshida 4th order": "yoshida4"}
+
+
+def derivatives_barnes_hut(state, t, m, n, use_gr, gr_factor):
+    """Same layout as derivatives(), with O(N log N) Barnes-Hut forces (2D only: the tree is a quadtree)."""
+    positions = state[:2*n].reshape(n, 2)
+    acc = barnes_hut_accelerations(positions, m, THETA, SOFTENING, gr_factor if use_gr else 0.0)
+    return np.concatenate([state[2*n:], acc.ravel()])
+
+
+def integrate(initial_state, times, m, n, use_gr, gr_factor, method="odeint", dt=None):
+    """Solve the system at the given times, picking the force kernel by body count.
+
+    initial_state is a 2D or 3D state vector (see nbody_state.py). method is "odeint" (adaptive) or
+    one of the fixed-step symplectic integrators, which take steps of at most dt seconds.
+    """
+    # The Barnes-Hut quadtree is 2D; 3D systems always use the direct kernel
+    tree = n >= BARNES_HUT_THRESHOLD and state_dim(initial_state, n) == 2
+    if method != "odeint":
+        if not tree:
+            accel_fn = lambda pos: accelerations(pos, m, use_gr, gr_factor, SOFTENING)
+        else:
+            accel_fn = lambda pos: barnes_hut_accelerations(pos, m, THETA, SOFTENING, gr_factor if use_gr else 0.0)
+        positions, velocities = unpack_state(np.asarray(initial_state, dtype=float), n)
+        return integrate_fixed(positions, velocities, times, dt, accel_fn, method)
+    if not tree:
+        return odeint(derivatives, initial_state, times, args=(m, n, use_gr, gr_factor, SOFTENING))
+    # LSODA can switch to its stiff method, which needs a dense (4N)^2 Jacobian; stay explicit for large N
+    sol = solve_ivp(lambda t, y: derivatives_barnes_hut(y, t, m, n, use_gr, gr_factor),
+                    (times[0], times[-1]), initial_state, method="RK45", t_eval=times, rtol=1e-6)
+    return sol.y.T
+
+
+def integrate_blocks(initial_state, times, m, n, use_gr, gr_factor, method="odeint", dt=None, cancel=None,
+                     chunk=STREAM_CHUNK):
+    """Integrate chunk frames at a time, yielding (first_frame, states (k, state size)) as each block is done.
+
+    Every block restarts the solver from the last state of the previous one, so the caller can use
+    the first frames long before the whole trajectory exists. Stops early once cancel is set.
+    """
+    state = np.asarray(initial_state, dtype=float)
+    yield 0, state[np.newaxis, :]
+    for lo in range(1, len(times), chunk):
+        if cancel is not None and cancel.is_set():
+            return
+        hi = min(lo + chunk, len(times))
+        sol = integrate(state, times[lo - 1:hi], m, n, use_gr, gr_factor, method, dt)
+        state = sol[-1]
+        yield lo, sol[1:]
+
+
+def stream_frames(initial_state, times, m, n, use_gr, gr_factor, method="odeint", dt=None, cancel=None,
+                  chunk=STREAM_CHUNK, checkpoints=None, key=None):
+    """Like integrate_blocks(), but yields the x-y positions (k, n, 2) in AU for display.
+
+    3D systems are shown projected onto the x-y plane. The state at every frame is saved to
+    checkpoints under key, if given.
+    """
+    dim = state_dim(initial_state, n)
+    for lo, states in integrate_blocks(initial_state, times, m, n, use_gr, gr_factor, method, dt, cancel, chunk):
+        if checkpoints is not None and lo:
+            for t, row in zip(times[lo:], states):
+                checkpoints.put(key, t, row)
+        yield lo, states[:, :dim*n].reshape(-1, n, dim)[..., :2] / AU
+
+
+def export_trajectory(path, initial_state, times, m, n, use_gr, gr_factor, method="odeint", dt=None, cancel=None):
+    """Integrate and stream every state to a compressed .npz/.h5 file (see trajectory_io.py); returns the frame count."""
+    with TrajectoryWriter(path, m, state_dim(initial_state, n)) as writer:
+        for lo, states in integrate_blocks(initial_state, times, m, n, use_gr, gr_factor, method, dt, cancel):
+            writer.append(times[lo:lo + len(states)], states)
+        return writer.frames
+
 
 class NBodyGUI:
     def __init__(self, root):
@@ -41,23 +118,44 @@ class NBodyGUI:
         self.root.title("Interactive N-Body Simulation")
 
         # Variables to store animation state
-        self.ani = None
+        self._play_id = None
         self.running = False
 
+        # Background solve state: pending debounce timer, cancel flag and frame queue of the current run
+        self._debounce_id = None
+        self._poll_id = None
+        self._cancel = None
+        self._results = None
+        self.frames = None
+        self.frames_ready = 0
+        self.play_index = -1
+
+        # Saved integrator states, filled by the animation solves and by predictions
+        self.checkpoints = CheckpointStore()
+
         # Number of bodies
-        self.n_label = tk.Label(root, text="Number of Bodies (1-5):")
+        self.n_label = tk.Label(root, text=f"Number of Bodies (1-{MAX_BODIES}):")
         self.n_label.pack()
         self.n_var = tk.IntVar(value=2)
         self.n_var.trace("w", self.update_inputs)
-        self.n_spin = tk.Spinbox(root, from_=1, to=5, textvariable=self.n_var)
+        self.n_spin = tk.Spinbox(root, from_=1, to=MAX_BODIES, textvariable=self.n_var)
         self.n_spin.pack()
 
-        # Input fields for masses, positions, and velocities
+        # Input fields for masses, positions, and velocities (scrollable, for large systems)
         self.mass_entries = []
         self.pos_entries = []
         self.vel_entries = []
-        self.input_frame = tk.Frame(root)
-        self.input_frame.pack()
+        self.input_container = tk.Frame(root)
+        self.input_container.pack(fill=tk.X)
+        self.input_canvas = tk.Canvas(self.input_container, height=150, highlightthickness=0)
+        self.input_scroll = tk.Scrollbar(self.input_container, orient=tk.VERTICAL, command=self.input_canvas.yview)
+        self.input_canvas.configure(yscrollcommand=self.input_scroll.set)
+        self.input_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.input_canvas.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.input_frame = tk.Frame(self.input_canvas)
+        self.input_canvas.create_window((0, 0), window=self.input_frame, anchor="nw")
+        self.input_frame.bind("<Configure>", lambda e: self.input_canvas.configure(
+            scrollregion=self.input_canvas.bbox("all"), width=self.input_frame.winfo_reqwidth()))
 
         # GR toggle and factor
         self.gr_frame = tk.Frame(root)
@@ -87,6 +185,20 @@ class NBodyGUI:
         self.frames_entry = tk.Entry(root, textvariable=self.frames_var)
         self.frames_entry.pack()
 
+        # Integrator and fixed time step (used by the symplectic integrators only)
+        self.integrator_frame = tk.Frame(root)
+        self.integrator_frame.pack()
+        self.integrator_var = tk.StringVar(value="odeint (adaptive)")
+        self.integrator_var.trace("w", self.update_simulation)
+        self.integrator_menu = tk.OptionMenu(self.integrator_frame, self.integrator_var, *INTEGRATOR_CHOICES)
+        self.integrator_menu.pack(side=tk.LEFT)
+        self.dt_label = tk.Label(self.integrator_frame, text="Time Step (s):")
+        self.dt_label.pack(side=tk.LEFT)
+        self.dt_var = tk.StringVar(value="1e4")
+        self.dt_var.trace("w", self.update_simulation)
+        self.dt_entry = tk.Entry(self.integrator_frame, textvariable=self.dt_var, width=10)
+        self.dt_entry.pack(side=tk.LEFT)
+
         # Prediction inputs
         self.predict_label = tk.Label(root, text="Future Time (s):")
         self.predict_label.pack()
@@ -97,6 +209,21 @@ class NBodyGUI:
         self.predict_button = tk.Button(root, text="Predict Positions", command=self.predict_positions)
         self.predict_button.pack()
 
+        # Large or 3D systems come from a CSV file: mass (kg), x (AU), y (AU), vx (m/s), vy (m/s),
+        # or for 3D: mass, x, y, z, vx, vy, vz
+        self.loaded_bodies = None
+        self.load_button = tk.Button(root, text="Load Bodies from CSV...", command=self.load_bodies)
+        self.load_button.pack()
+
+        # Write the full trajectory (positions and velocities of every frame) to .npz or .h5
+        self.export_button = tk.Button(root, text="Export Trajectory...", command=self.export_trajectory)
+        self.export_button.pack()
+
+        # Solver status
+        self.status_var = tk.StringVar(value="")
+        self.status_label = tk.Label(root, textvariable=self.status_var)
+        self.status_label.pack()
+
         # Output text
         self.output_text = tk.Text(root, height=10, width=50)
         self.output_text.pack()
@@ -106,16 +233,25 @@ class NBodyGUI:
         self.ax = self.fig.add_subplot(111)
         self.canvas = FigureCanvasTkAgg(self.fig, master=root)
         self.canvas.get_tk_widget().pack()
+        self.renderer = OrbitRenderer(self.ax, self.canvas)
 
         # Initial setup
         self.update_inputs()
 
     def update_inputs(self, *args):
+        try:
+            n = self.n_var.get()
+        except tk.TclError:
+            return  # Spinbox is mid-edit (empty or not a number)
+        if not 1 <= n <= MAX_BODIES:
+            return
+
+        self.loaded_bodies = None
+
         # Clear previous inputs
         for widget in self.input_frame.winfo_children():
             widget.destroy()
 
-        n = self.n_var.get()
         self.mass_entries = []
         self.pos_entries = []
         self.vel_entries = []
@@ -134,7 +270,8 @@ class NBodyGUI:
             
             pos_label = tk.Label(self.input_frame, text="x (AU):")
             pos_label.grid(row=i, column=3)
-            x_var = tk.StringVar(value="0" if i == 0 else "1")
+            # Orbiting bodies start 1, 2, 3, ... AU out so they never coincide
+            x_var = tk.StringVar(value="0" if i == 0 else str(i))
             x_var.trace("w", self.update_simulation)
             x_entry = tk.Entry(self.input_frame, textvariable=x_var)
             x_entry.grid(row=i, column=4)
@@ -156,7 +293,8 @@ class NBodyGUI:
             
             vel_label_y = tk.Label(self.input_frame, text="vy (m/s):")
             vel_label_y.grid(row=i, column=9)
-            vy_var = tk.StringVar(value="0" if i == 0 else "2.11e4" if i == 1 and n == 2 else "0")
+            # Circular orbit speed around the 1e30 kg central body (2.11e4 m/s at 1 AU)
+            vy_var = tk.StringVar(value="0" if i == 0 else f"{np.sqrt(G * 1e30 / (i * AU)):.3g}")
             vy_var.trace("w", self.update_simulation)
             vy_entry = tk.Entry(self.input_frame, textvariable=vy_var)
             vy_entry.grid(row=i, column=10)
@@ -164,7 +302,51 @@ class NBodyGUI:
 
         self.update_simulation()
 
+    def load_bodies(self):
+        path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            bodies = np.loadtxt(path, delimiter=",", ndmin=2)
+        except ValueError as e:
+            self.output_text.delete(1.0, tk.END)
+            self.output_text.insert(tk.END, f"Could not read {path}: {e}\n")
+            return
+        if bodies.shape[1] not in (5, 7):
+            self.output_text.delete(1.0, tk.END)
+            self.output_text.insert(tk.END, "Expected 5 columns (mass, x, y, vx, vy) or 7 (mass, x, y, z, vx, vy, vz).\n")
+            return
+
+        for widget in self.input_frame.winfo_children():
+            widget.destroy()
+        self.loaded_bodies = bodies
+        dim = (bodies.shape[1] - 1) // 2
+        kernel = "Barnes-Hut" if len(bodies) >= BARNES_HUT_THRESHOLD and dim == 2 else "direct"
+        tk.Label(self.input_frame, text=f"{len(bodies)} bodies loaded ({dim}D, {kernel} forces). "
+                                        "Change the number of bodies to edit by hand.").grid(row=0, column=0)
+        self.update_simulation()
+
+    def get_integrator(self):
+        """Return (method, dt) from the integrator controls, or None if the time step is invalid."""
+        method = INTEGRATOR_CHOICES[self.integrator_var.get()]
+        try:
+            dt = float(self.dt_var.get())
+        except ValueError:
+            return None
+        if method != "odeint" and not dt > 0:
+            return None
+        return method, dt
+
     def get_parameters(self):
+        if self.loaded_bodies is not None:
+            try:
+                bodies = self.loaded_bodies
+                dim = (bodies.shape[1] - 1) // 2
+                return (len(bodies), bodies[:, 0], (bodies[:, 1:1 + dim] * AU).ravel(), bodies[:, 1 + dim:].ravel(),
+                        float(self.time_var.get()), int(self.frames_var.get()),
+                        self.use_gr_var.get(), float(self.gr_factor_var.get()))
+            except ValueError:
+                return None
         try:
             n = self.n_var.get()
             m = [float(entry.get()) for entry in self.mass_entries]
@@ -187,50 +369,176 @@ class NBodyGUI:
             return None
 
     def update_simulation(self, *args):
-        if self.ani is not None:
-            self.ani.event_source.stop()
+        """Schedule a new solve once the inputs have stopped changing for DEBOUNCE_MS."""
+        if self._debounce_id is not None:
+            self.root.after_cancel(self._debounce_id)
+        self._debounce_id = self.root.after(DEBOUNCE_MS, self.start_simulation)
+
+    def cancel_simulation(self):
+        """Stop the animation and abandon the solve in progress, if any."""
+        if self._play_id is not None:
+            self.root.after_cancel(self._play_id)
+            self._play_id = None
             self.running = False
+        if self._cancel is not None:
+            self._cancel.set()
+            self._cancel = None
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+
+    def start_simulation(self):
+        self._debounce_id = None
+        self.cancel_simulation()
 
         params = self.get_parameters()
-        if params is None:
+        integrator = self.get_integrator()
+        if params is None or integrator is None:
             return
 
         n, m, initial_positions, initial_velocities, total_time, num_frames, use_gr, gr_factor = params
-        initial_state = np.array(initial_positions + initial_velocities)
-
+        method, dt = integrator
+        if num_frames < 1:
+            return
+        initial_state = np.concatenate([initial_positions, initial_velocities])
         times = np.linspace(0, total_time, num_frames)
-        sol = odeint(derivatives, initial_state, times, args=(m, n, use_gr, gr_factor))
-
-        self.ax.clear()
-        x_all = sol[:, 0:2*n:2] / AU
-        y_all = sol[:, 1:2*n:2] / AU
-        self.ax.set_xlim(np.min(x_all) * 1.1, np.max(x_all) * 1.1)
-        self.ax.set_ylim(np.min(y_all) * 1.1, np.max(y_all) * 1.1)
-        self.ax.set_xlabel("x (AU)")
-        self.ax.set_ylabel("y (AU)")
-        title = "N-Body Simulation (Newtonian)" if not use_gr else "N-Body Simulation (GR Approx)"
-        self.ax.set_title(title)
-        self.ax.grid(True)
 
-        scatter = self.ax.scatter(x_all[0], y_all[0], c=np.arange(n), cmap='tab10', s=50)
+        # Each run gets its own queue and cancel flag, so frames from a superseded run can never show up
+        self._cancel = threading.Event()
+        self._results = queue.Queue()
+        key = trajectory_key(initial_state, m, use_gr, gr_factor, method, dt)
+        worker = threading.Thread(target=self._solve_worker, daemon=True,
+                                  args=(self._results, self._cancel, self.checkpoints, key,
+                                        initial_state, times, m, n, use_gr, gr_factor, method, dt))
+        worker.start()
 
-        def update(frame):
-            scatter.set_offsets(np.c_[x_all[frame], y_all[frame]])
-            return scatter,
+        self.frames = np.empty((num_frames, n, 2))
+        self.frames_ready = 0
+        self.play_index = -1
+        self.status_var.set(f"Integrating... 0/{num_frames} frames")
+
+        title = "N-Body Simulation (Newtonian)" if not use_gr else "N-Body Simulation (GR Approx)"
+        positions, _ = unpack_state(initial_state, n)
+        if positions.shape[1] == 3:
+            title += " - x-y projection"
+        self.renderer.reset(positions[:, :2] / AU, title)
 
-        self.ani = animation.FuncAnimation(self.fig, update, frames=num_frames, interval=50, blit=True, repeat=True)
         self.running = True
-        self.canvas.draw()
+        self._play_id = self.root.after(FRAME_INTERVAL_MS, self.play_frame)
+        self._poll_id = self.root.after(POLL_MS, self.poll_frames)
+
+    def play_frame(self):
+        """Animation tick: advance through the frames that have arrived, looping once all are in."""
+        self._play_id = None
+        if self.frames_ready:
+            stride = frame_stride(len(self.frames), FRAME_INTERVAL_MS, self.renderer.draw_seconds)
+            start = self.play_index + 1
+            target = self.play_index + stride
+            if target >= self.frames_ready:
+                if self.frames_ready == len(self.frames) and self.play_index == self.frames_ready - 1:
+                    start = target = 0
+                    self.renderer.clear_trails()
+                else:
+                    target = self.frames_ready - 1
+            if target >= start:
+                # Skipped frames still go into the trails, so decimation doesn't make them jagged
+                self.renderer.push(self.frames[start:target + 1])
+                self.play_index = target
+                self.renderer.draw_frame(self.frames[target])
+        self._play_id = self.root.after(FRAME_INTERVAL_MS, self.play_frame)
+
+    @staticmethod
+    def _solve_worker(results, cancel, checkpoints, key, *args):
+        """Runs on the worker thread: never touches Tk, only the results queue and checkpoint store."""
+        try:
+            for block in stream_frames(*args, cancel=cancel, checkpoints=checkpoints, key=key):
+                results.put(block)
+            results.put(None)
+        except Exception as e:  # hand solver failures to the GUI thread instead of dying silently
+            results.put(e)
+
+    def poll_frames(self):
+        """Move finished frames from the worker into the animation buffer (GUI thread)."""
+        self._poll_id = None
+        done = False
+        grown = False
+        while True:
+            try:
+                item = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                done = True
+                break
+            if isinstance(item, Exception):
+                self.status_var.set(f"Integration failed: {item}")
+                return
+            lo, block = item
+            self.frames[lo:lo + len(block)] = block
+            self.frames_ready = lo + len(block)
+            grown |= self.renderer.extend_limits(block)
+
+        if grown:
+            self.renderer.redraw()
+        if done:
+            self.status_var.set(f"{self.frames_ready} frames")
+            self._cancel = None
+        else:
+            self.status_var.set(f"Integrating... {self.frames_ready}/{len(self.frames)} frames")
+            self._poll_id = self.root.after(POLL_MS, self.poll_frames)
+
+    def export_trajectory(self):
+        params = self.get_parameters()
+        integrator = self.get_integrator()
+        if params is None or integrator is None:
+            self.output_text.delete(1.0, tk.END)
+            self.output_text.insert(tk.END, "Invalid input parameters.\n")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".npz",
+                                            filetypes=[("Compressed NumPy", "*.npz"), ("HDF5", "*.h5 *.hdf5")])
+        if not path:
+            return
+
+        n, m, initial_positions, initial_velocities, total_time, num_frames, use_gr, gr_factor = params
+        method, dt = integrator
+        initial_state = np.concatenate([initial_positions, initial_velocities])
+        times = np.linspace(0, total_time, num_frames)
+        self.export_button.config(state=tk.DISABLED)
+        self.status_var.set(f"Exporting {num_frames} frames to {path}...")
+
+        # Like the animation solve, the worker only reports through a queue; Tk is touched on the GUI thread
+        done = queue.Queue()
+
+        def work():
+            try:
+                frames = export_trajectory(path, initial_state, times, m, n, use_gr, gr_factor, method, dt)
+                done.put(f"Exported {frames} frames to {path}")
+            except Exception as e:
+                done.put(f"Export failed: {e}")
+
+        def check():
+            try:
+                message = done.get_nowait()
+            except queue.Empty:
+                self.root.after(POLL_MS, check)
+                return
+            self.export_button.config(state=tk.NORMAL)
+            self.status_var.set(message)
+
+        threading.Thread(target=work, daemon=True).start()
+        self.root.after(POLL_MS, check)
 
     def predict_positions(self):
         params = self.get_parameters()
-        if params is None:
+        integrator = self.get_integrator()
+        if params is None or integrator is None:
             self.output_text.delete(1.0, tk.END)
             self.output_text.insert(tk.END, "Invalid input parameters.\n")
             return
 
         n, m, initial_positions, initial_velocities, _, _, use_gr, gr_factor = params
-        initial_state = np.array(initial_positions + initial_velocities)
+        method, dt = integrator
+        initial_state = np.concatenate([initial_positions, initial_velocities])
         try:
             t_future = float(self.predict_var.get())
         except ValueError:
@@ -238,19 +546,36 @@ class NBodyGUI:
             self.output_text.insert(tk.END, "Invalid future time.\n")
             return
 
-        sol = odeint(derivatives, initial_state, [0, t_future], args=(m, n, use_gr, gr_factor))
-        positions = sol[-1, :2*n].reshape(n, 2) / AU
+        # Resume from the nearest saved state on the way to t_future instead of starting over at t = 0
+        key = trajectory_key(initial_state, m, use_gr, gr_factor, method, dt)
+        t0, state = self.checkpoints.nearest(key, t_future) or (0.0, initial_state)
+        if t0 != t_future:
+            state = integrate(state, np.array([t0, t_future]), m, n, use_gr, gr_factor, method, dt)[-1]
+            self.checkpoints.put(key, t_future, state)
+        positions = unpack_state(state, n)[0] / AU
+        axes = "xyz"[:positions.shape[1]]
 
         output = f"Positions at t = {t_future} s ({'Newtonian' if not use_gr else 'GR Approx'}):\n"
-        for i in range(n):
-            output += f"Body {i+1}: x = {positions[i,0]:.2f} AU, y = {positions[i,1]:.2f} AU\n"
-        output += "\nRelative distances:\n"
-        for i in range(n):
-            for j in range(i+1, n):
-                dx = positions[i,0] - positions[j,0]
-                dy = positions[i,1] - positions[j,1]
-                dist = np.sqrt(dx**2 + dy**2)
-                output += f"Body {i+1} - Body {j+1}: {dist:.2f} AU\n"
+        if t0:
+            output += f"(resumed from checkpoint at t = {t0:.4g} s)\n"
+        for i in range(min(n, MAX_LISTED)):
+            output += f"Body {i+1}: " + ", ".join(f"{a} = {v:.2f} AU" for a, v in zip(axes, positions[i])) + "\n"
+        if n > MAX_LISTED:
+            output += f"... {n - MAX_LISTED} more bodies\n"
+        else:
+            output += "\nRelative distances:\n"
+            for i in range(n):
+                for j in range(i+1, n):
+                    dist = np.linalg.norm(positions[i] - positions[j])
+                    output += f"Body {i+1} - Body {j+1}: {dist:.2f} AU\n"
+        if n <= MAX_BODIES and not use_gr:
+            # The GR approximation is not a conservative force, so the drift is only meaningful for Newtonian runs
+            drift = energy_drift(np.array([initial_state, state]), m, SOFTENING)[-1]
+            half = len(initial_state) // 2
+            if energy(initial_state[:half], initial_state[half:], m, SOFTENING) != 0:
+                output += f"\nRelative energy drift ({self.integrator_var.get()}): {drift:.2e}\n"
+            else:
+                output += f"\nEnergy drift ({self.integrator_var.get()}): {drift:.2e} J\n"
         if use_gr:
             output += "\nGR Note: Precession exaggerated by factor for visibility.\n"
         self.output_text.delete(1.0, tk.END)
@@ -267,6 +592,17 @@ root.mainloop()
 # The simulation will display the motion of the bodies in a 2D plot, and you can predict their positions
 # at a future time using the "Predict Positions" button.
 # The output will show the predicted positions and relative distances between bodies.
+# Edits are debounced and integrated on a background thread: the animation starts with the first
+# frames and keeps playing while the rest of the trajectory streams in. Bodies are drawn with
+# trails by a blitting renderer (see orbit_renderer.py) that skips frames on long or heavy runs.
+# Large or 3D systems can be loaded from CSV (3D runs are shown projected onto the x-y plane), and
+# "Export Trajectory..." streams every frame to a compressed .npz (or .h5, with h5py installed) file;
+# read it back with trajectory_io.read_trajectory().
+# Integrator states along the animated trajectory and at every predicted time are kept (up to a
+# memory budget) so later predictions only integrate from the nearest earlier checkpoint.
+# The integrator menu switches between odeint (adaptive LSODA) and the fixed-step symplectic
+# leapfrog and Yoshida 4th-order integrators (see integrators.py), which keep the energy bounded
+# over long orbital runs; the prediction output reports the relative energy drift of the run.
 # Note: The gravitational constant G and other constants are set for a simplified simulation.
 
 # The simulation uses a simplified post-Newtonian approximation for GR effects.
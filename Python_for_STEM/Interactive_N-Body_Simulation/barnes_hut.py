@@ -0,0 +1,166 @@
+from collections import namedtuple
+
+import numpy as np
+
+from nbody_state import C, G
+
+# Barnes-Hut tree code for large N: O(N log N) gravity from a quadtree stored in flat arrays.
+#
+# The tree is built level by level from Morton (Z-order) codes: after sorting the bodies by
+# code, every node is a contiguous run of bodies sharing a code prefix, so no node objects or
+# recursion are needed. Forces are then evaluated for a block of bodies at once by walking
+# (body, node) pairs through the tree with array operations.
+
+MAX_DEPTH = 20  # Levels below the root; nodes still holding several bodies here become leaves
+CHUNK = 1024  # Bodies walked through the tree together (bounds the (body, node) pair arrays)
+
+# Flat node arrays. Node k covers sorted bodies [start[k], start[k] + count[k]) and its children
+# are nodes first_child[k] .. first_child[k] + n_children[k] - 1 (n_children == 0 for leaves).
+# offset is the distance from a node's centre of mass to its geometric centre.
+QuadTree = namedtuple("QuadTree", ["order", "mass", "com", "size", "offset", "start", "count", "first_child", "n_children"])
+
+
+def _part1by1(v):
+    """Spread the low 32 bits of v so they occupy the even bit positions."""
+    v = v & np.uint64(0xFFFFFFFF)
+    for shift, mask in ((16, 0x0000FFFF0000FFFF), (8, 0x00FF00FF00FF00FF), (4, 0x0F0F0F0F0F0F0F0F),
+                        (2, 0x3333333333333333), (1, 0x5555555555555555)):
+        v = (v | (v << np.uint64(shift))) & np.uint64(mask)
+    return v
+
+
+def build_tree(positions, masses, max_depth=MAX_DEPTH):
+    """Build the quadtree of (n, 2) positions with masses (n,)."""
+    n = len(positions)
+    lo = positions.min(axis=0)
+    size = float((positions.max(axis=0) - lo).max()) or 1.0
+    size *= 1.0 + 1e-9  # keep the farthest body strictly inside the root square
+    cells = ((positions - lo) * ((1 << max_depth) / size)).astype(np.uint64)
+    cells = np.minimum(cells, np.uint64((1 << max_depth) - 1))
+    codes = _part1by1(cells[:, 0]) | (_part1by1(cells[:, 1]) << np.uint64(1))
+
+    order = np.argsort(codes, kind="stable")
+    codes = codes[order]
+    m = masses[order]
+    weighted = positions[order] * m[:, np.newaxis]
+    first_pos = positions[order]
+    cells = cells[order]
+
+    # One entry per level: (prefix, start, count, mass, com, offset)
+    levels = []
+    active = np.arange(n)  # sorted bodies whose node at the previous level still holds several bodies
+    for level in range(max_depth + 1):
+        prefix = codes[active] >> np.uint64(2 * (max_depth - level))
+        starts = np.flatnonzero(np.r_[True, prefix[1:] != prefix[:-1]])
+        counts = np.diff(np.r_[starts, active.size])
+        mass = np.add.reduceat(m[active], starts)
+        com = np.add.reduceat(weighted[active], starts, axis=0)
+        massive = mass > 0
+        com[massive] /= mass[massive, np.newaxis]
+        com[~massive] = first_pos[active[starts[~massive]]]
+        node_size = size / 2**level
+        centre = lo + ((cells[active[starts]] >> np.uint64(max_depth - level)) + 0.5) * node_size
+        offset = np.linalg.norm(com - centre, axis=1)
+        levels.append((prefix[starts], active[starts], counts, mass, com, offset))
+
+        split = counts > 1
+        if not split.any():
+            break
+        active = active[np.repeat(split, counts)]
+
+    # Flatten the levels and link each node to its contiguous block of children
+    offsets = np.cumsum([0] + [len(lev[0]) for lev in levels])
+    first_child, n_children = [], []
+    for level, (prefix, *_rest) in enumerate(levels):
+        if level + 1 < len(levels):
+            parents_of_next = levels[level + 1][0] >> np.uint64(2)
+            first = np.searchsorted(parents_of_next, prefix, side="left")
+            last = np.searchsorted(parents_of_next, prefix, side="right")
+            first_child.append(offsets[level + 1] + first)
+            n_children.append(last - first)
+        else:
+            first_child.append(np.zeros(len(prefix), dtype=np.int64))
+            n_children.append(np.zeros(len(prefix), dtype=np.int64))
+
+    return QuadTree(
+        order=order,
+        mass=np.concatenate([lev[3] for lev in levels]),
+        com=np.concatenate([lev[4] for lev in levels]),
+        offset=np.concatenate([lev[5] for lev in levels]),
+        size=np.concatenate([np.full(len(lev[0]), size / 2**level) for level, lev in enumerate(levels)]),
+        start=np.concatenate([lev[1] for lev in levels]),
+        count=np.concatenate([lev[2] for lev in levels]),
+        first_child=np.concatenate(first_child),
+        n_children=np.concatenate(n_children),
+    )
+
+
+def accelerations(positions, masses, theta=0.5, softening=0.0, gr_factor=0.0, chunk=CHUNK):
+    """Gravitational accelerations (n, 2) of all bodies, using the Barnes-Hut approximation.
+
+    A node is replaced by its centre of mass when distance > size / theta + offset (the opening
+    test of Barnes 1994, which stays safe when the centre of mass sits near a cell edge) and
+    the body is not inside it; theta = 0 gives the exact direct sum. gr_factor > 0 applies the same simplified
+    post-Newtonian factor (1 + gr_factor G M / (c^2 r)) as the direct-sum kernel.
+    """
+    positions = np.asarray(positions, dtype=float)
+    masses = np.asarray(masses, dtype=float)
+    n = len(positions)
+    acc = np.zeros((n, 2))
+    if n < 2:
+        return acc
+
+    tree = build_tree(positions, masses)
+    rank = np.empty(n, dtype=np.int64)
+    rank[tree.order] = np.arange(n)
+    # Opening radius of every node; a body farther than this from the centre of mass uses the monopole
+    radius2 = (tree.size / theta + tree.offset) ** 2 if theta > 0 else np.full(len(tree.size), np.inf)
+    eps2 = softening**2
+
+    for lo in range(0, n, chunk):
+        width = min(chunk, n - lo)
+        body = np.arange(lo, lo + width)
+        node = np.zeros(body.size, dtype=np.int64)  # every body starts at the root
+        while body.size:
+            d = tree.com[node] - positions[body]
+            r2 = np.einsum("ij,ij->i", d, d)
+            rk = rank[body]
+            inside = (tree.start[node] <= rk) & (rk < tree.start[node] + tree.count[node])
+            leaf = tree.n_children[node] == 0
+            use = leaf | (~inside & (r2 > radius2[node]))
+
+            own = inside & use  # leaves holding the body itself
+            far = use & ~own
+            b, du, mass = body[far], d[far], tree.mass[node[far]]
+            if own.any():
+                # Sum the other bodies of the leaf directly (only max-depth leaves have any):
+                # a monopole with the body removed suffers cancellation for near-coincident bodies
+                k = node[own]
+                cnt = tree.count[k]
+                ob = np.repeat(body[own], cnt)
+                members = tree.order[np.repeat(tree.start[k], cnt) + np.arange(cnt.sum()) - np.repeat(np.cumsum(cnt) - cnt, cnt)]
+                others = members != ob
+                ob, members = ob[others], members[others]
+                b = np.concatenate([b, ob])
+                du = np.concatenate([du, positions[members] - positions[ob]])
+                mass = np.concatenate([mass, masses[members]])
+
+            r2u = np.einsum("ij,ij->i", du, du) + eps2
+            r = np.sqrt(r2u)
+            coeff = np.zeros(b.size)
+            ok = (r2u > 0) & (mass > 0)
+            coeff[ok] = G * mass[ok] / (r2u[ok] * r[ok])
+            if gr_factor > 0:
+                coeff[ok] *= 1.0 + gr_factor * G * mass[ok] / (C**2 * r[ok])
+            local = b - lo
+            acc[lo:lo + width, 0] += np.bincount(local, weights=coeff * du[:, 0], minlength=width)
+            acc[lo:lo + width, 1] += np.bincount(local, weights=coeff * du[:, 1], minlength=width)
+
+            # Open every node that was too close: replace the pair by one pair per child
+            body, node = body[~use], node[~use]
+            kids = tree.n_children[node]
+            body = np.repeat(body, kids)
+            base = np.repeat(tree.first_child[node], kids)
+            node = base + np.arange(kids.sum()) - np.repeat(np.cumsum(kids) - kids, kids)
+
+    return acc
@@ -0,0 +1,83 @@
+import hashlib
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+
+import numpy as np
+
+# Integrator states saved along trajectories, so a prediction at time t can resume from the nearest
+# saved state instead of integrating from t = 0 again.
+
+MAX_BYTES = 64 << 20  # Memory for saved states across all trajectories; least recently used go first
+
+
+def trajectory_key(initial_state, m, *settings):
+    """Identify a trajectory by its initial state, masses and solver settings (gr flag, method, dt, ...)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.ascontiguousarray(initial_state, dtype=float).tobytes())
+    h.update(np.ascontiguousarray(m, dtype=float).tobytes())
+    h.update(repr(settings).encode())
+    return h.digest()
+
+
+class CheckpointStore:
+    """Store of (trajectory, time) -> state vector, bounded to max_bytes with LRU eviction.
+
+    Safe to share between the GUI and the background solver thread.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._states = OrderedDict()  # (key, t) -> state, least recently used first
+        self._times = {}  # key -> sorted times stored for that trajectory
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._states)
+
+    def put(self, key, t, state):
+        t = float(t)
+        with self._lock:
+            if (key, t) in self._states:
+                self._states.move_to_end((key, t))
+                return
+            state = np.array(state, dtype=float)
+            self._states[(key, t)] = state
+            self.nbytes += state.nbytes
+            insort(self._times.setdefault(key, []), t)
+            # Always keep the newest state, even if it alone exceeds the budget
+            while self.nbytes > self.max_bytes and len(self._states) > 1:
+                (old_key, old_t), old = self._states.popitem(last=False)
+                self.nbytes -= old.nbytes
+                times = self._times[old_key]
+                del times[bisect_left(times, old_t)]
+                if not times:
+                    del self._times[old_key]
+
+    def nearest(self, key, t):
+        """Return (t0, state) for the stored state closest to t on the way from 0 to t, or None.
+
+        For t >= 0 that is the latest checkpoint in [0, t]; for t < 0 the earliest in [t, 0].
+        """
+        with self._lock:
+            times = self._times.get(key)
+            if not times:
+                return None
+            if t >= 0:
+                i = bisect_right(times, t) - 1
+                if i < 0 or times[i] < 0:
+                    return None
+            else:
+                i = bisect_left(times, t)
+                if i == len(times) or times[i] > 0:
+                    return None
+            t0 = times[i]
+            self._states.move_to_end((key, t0))
+            return t0, self._states[(key, t0)].copy()
+
+    def clear(self):
+        with self._lock:
+            self._states.clear()
+            self._times.clear()
+            self.nbytes = 0
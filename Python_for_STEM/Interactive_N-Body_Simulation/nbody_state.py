@@ -0,0 +1,94 @@
+import threading
+
+import numpy as np
+
+# State layout and force kernel shared by the N-body scripts (this folder and
+# 3-Body_problem_Circular_Simulation), for 2D and 3D systems alike.
+#
+# A state is one flat vector [positions, velocities]: n * dim position coordinates
+# (x0, y0[, z0], x1, y1[, z1], ...) followed by the n * dim velocity components in the same
+# order, so odeint and solve_ivp can work on it directly. dim is implied by the length.
+
+G = 6.67430e-11  # Gravitational constant in m^3 kg^-1 s^-2
+C = 3.0e8  # Speed of light in m/s
+
+
+def pack_state(positions, velocities):
+    """Flatten (n, dim) positions and velocities into one state vector."""
+    return np.concatenate([np.ravel(positions), np.ravel(velocities)]).astype(float)
+
+
+def state_dim(state, n):
+    """Number of spatial dimensions of a state vector for n bodies."""
+    return len(state) // (2 * n)
+
+
+def unpack_state(state, n):
+    """Return (positions, velocities) of a state vector as (n, dim) views."""
+    dim = state_dim(state, n)
+    return state[:dim*n].reshape(n, dim), state[dim*n:].reshape(n, dim)
+
+
+class _Workspace:
+    """Scratch arrays for accelerations(), allocated once per body count and dimension and reused across calls."""
+
+    def __init__(self, n, dim):
+        self.diff = np.empty((n, n, dim))  # diff[i, j] = r_j - r_i
+        self.r2 = np.empty((n, n))
+        self.r = np.empty((n, n))
+        self.coeff = np.empty((n, n))
+        self.gr = np.zeros((n, n))  # entries with r = 0 are never written and must stay finite
+        self.out = np.empty(2 * dim * n)
+        self.acc = self.out[dim*n:].reshape(n, dim)
+
+
+# One set of workspaces per thread, so a background solver never shares buffers with the GUI
+_workspaces = threading.local()
+
+
+def _get_workspace(n, dim):
+    cache = getattr(_workspaces, "by_shape", None)
+    if cache is None:
+        cache = _workspaces.by_shape = {}
+    if (n, dim) not in cache:
+        cache[(n, dim)] = _Workspace(n, dim)
+    return cache[(n, dim)]
+
+
+def accelerations(positions, m, use_gr=False, gr_factor=0.0, softening=0.0):
+    """All pairwise forces on (n, dim) positions in a few broadcast array operations (O(N^2) memory and work).
+
+    softening is a Plummer length (m) added to every pairwise distance. The returned (n, dim)
+    array is a reused buffer: it is only valid until the next call with the same shape.
+    """
+    n, dim = positions.shape
+    ws = _get_workspace(n, dim)
+    m = np.asarray(m, dtype=float)
+
+    np.subtract(positions[np.newaxis, :, :], positions[:, np.newaxis, :], out=ws.diff)
+    np.einsum("ijk,ijk->ij", ws.diff, ws.diff, out=ws.r2)
+    if softening:
+        ws.r2 += softening**2
+    np.sqrt(ws.r2, out=ws.r)
+
+    # Newtonian: a_i = sum_j G m_j (r_j - r_i) / r^3, skipping i == j and coincident bodies (r = 0)
+    np.multiply(ws.r2, ws.r, out=ws.coeff)
+    np.divide(G, ws.coeff, out=ws.coeff, where=ws.coeff > 0)
+    ws.coeff *= m[np.newaxis, :]
+
+    # GR correction (simplified post-Newtonian term): a_gr = a_newton * gr_factor * G m_j / (c^2 r)
+    if use_gr and gr_factor > 0:
+        np.divide(gr_factor * G * m[np.newaxis, :] / C**2, ws.r, out=ws.gr, where=ws.r > 0)
+        ws.coeff *= ws.gr + 1.0
+
+    np.einsum("ij,ijk->ik", ws.coeff, ws.diff, out=ws.acc)
+    return ws.acc
+
+
+def derivatives(state, t, m, n, use_gr=False, gr_factor=0.0, softening=0.0):
+    """State derivative for odeint; shares its buffer with accelerations()."""
+    dim = state_dim(state, n)
+    ws = _get_workspace(n, dim)
+    accelerations(state[:dim*n].reshape(n, dim), m, use_gr, gr_factor, softening)
+    ws.out[:dim*n] = state[dim*n:]
+    return ws.out
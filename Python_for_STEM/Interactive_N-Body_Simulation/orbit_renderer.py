@@ -0,0 +1,136 @@
+import time
+
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.collections import LineCollection
+from matplotlib.colors import Normalize
+
+# Persistent blitted renderer for the N-body animation.
+#
+# The axes, grid and labels are drawn once and cached as a background image; every frame only
+# restores that image and redraws the body markers and their trails. A full redraw (and a new
+# background) happens only when the view has to grow to keep the bodies in sight.
+
+TRAIL_LENGTH = 100  # Frames of history drawn behind each body
+MAX_TRAIL_BODIES = 200  # Above this many bodies trails are skipped: they would cost more than the markers
+MAX_DISPLAY_FRAMES = 500  # Longer runs are decimated to at most this many drawn frames per loop
+HEADROOM = 0.25  # Extra room added when the view grows, so slow drift doesn't force a redraw every block
+
+
+class OrbitRenderer:
+    """Draws one frame of body positions (n, 2) at a time onto ax using blitting."""
+
+    def __init__(self, ax, canvas):
+        self.ax = ax
+        self.canvas = canvas
+        self.background = None
+        self.scatter = None
+        self.trails = None
+        self.trail_buffer = None  # ring buffer (TRAIL_LENGTH, n, 2) of recent positions
+        self.trail_head = 0
+        self.trail_count = 0
+        self.limits = None  # [xmin, xmax, ymin, ymax] of everything seen so far
+        self.draw_seconds = 0.0  # duration of the last blitted frame
+        ax.set_xlabel("x (AU)")
+        ax.set_ylabel("y (AU)")
+        ax.grid(True)
+        canvas.mpl_connect("draw_event", self._on_draw)
+
+    def reset(self, positions, title):
+        """Start a new run with the bodies at positions (n, 2)."""
+        n = len(positions)
+        if self.scatter is not None:
+            self.scatter.remove()
+        if self.trails is not None:
+            self.trails.remove()
+        colors = colormaps["tab10"](Normalize(0, max(n - 1, 1))(np.arange(n)))
+        self.scatter = self.ax.scatter(positions[:, 0], positions[:, 1], c=colors, s=50, zorder=3, animated=True)
+        if n <= MAX_TRAIL_BODIES:
+            self.trails = LineCollection([], colors=colors, linewidths=1, alpha=0.6, animated=True)
+            self.ax.add_collection(self.trails)
+            self.trail_buffer = np.empty((TRAIL_LENGTH, n, 2))
+        else:
+            self.trails = None
+            self.trail_buffer = None
+        self.clear_trails()
+        self.ax.set_title(title)
+        self.limits = None
+        self.extend_limits(positions)
+        self.redraw()
+
+    def clear_trails(self):
+        self.trail_head = 0
+        self.trail_count = 0
+
+    def extend_limits(self, positions):
+        """Track the extremes of positions (..., 2); grow the view if any of them falls outside it.
+
+        Returns True if the axes limits changed (the caller should then redraw()).
+        """
+        x, y = positions[..., 0], positions[..., 1]
+        seen = [np.min(x), np.max(x), np.min(y), np.max(y)]
+        if self.limits is not None:
+            x0, x1 = self.ax.get_xlim()
+            y0, y1 = self.ax.get_ylim()
+            self.limits = [min(seen[0], self.limits[0]), max(seen[1], self.limits[1]),
+                           min(seen[2], self.limits[2]), max(seen[3], self.limits[3])]
+            if seen[0] >= x0 and seen[1] <= x1 and seen[2] >= y0 and seen[3] <= y1:
+                return False
+        else:
+            self.limits = seen
+        self.ax.set_xlim(*self._padded(self.limits[0], self.limits[1]))
+        self.ax.set_ylim(*self._padded(self.limits[2], self.limits[3]))
+        return True
+
+    @staticmethod
+    def _padded(lo, hi):
+        pad = (hi - lo) * HEADROOM or max(abs(lo), 1.0) * 0.1
+        return lo - pad, hi + pad
+
+    def redraw(self):
+        """Full redraw of the static parts; the background is recaptured in _on_draw."""
+        self.canvas.draw()
+
+    def _on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_artists()
+
+    def push(self, frames):
+        """Append frames (k, n, 2) to the trail ring buffer; only the last TRAIL_LENGTH can survive."""
+        if self.trail_buffer is None:
+            return
+        for positions in frames[-TRAIL_LENGTH:]:
+            self.trail_buffer[self.trail_head] = positions
+            self.trail_head = (self.trail_head + 1) % TRAIL_LENGTH
+        self.trail_count = min(self.trail_count + len(frames), TRAIL_LENGTH)
+
+    def draw_frame(self, positions):
+        """Blit the bodies at positions (n, 2) with their trails."""
+        start = time.perf_counter()
+        self.scatter.set_offsets(positions)
+        if self.trails is not None:
+            if self.trail_count < TRAIL_LENGTH:
+                ordered = self.trail_buffer[:self.trail_count]
+            else:
+                ordered = np.concatenate([self.trail_buffer[self.trail_head:], self.trail_buffer[:self.trail_head]])
+            self.trails.set_segments(ordered.transpose(1, 0, 2) if self.trail_count > 1 else [])
+        if self.background is None:
+            self.canvas.draw()  # first frame: _on_draw captures the background and draws the artists
+        else:
+            self.canvas.restore_region(self.background)
+            self._draw_artists()
+            self.canvas.blit(self.ax.bbox)
+        self.draw_seconds = time.perf_counter() - start
+
+    def _draw_artists(self):
+        if self.trails is not None:
+            self.ax.draw_artist(self.trails)
+        if self.scatter is not None:
+            self.ax.draw_artist(self.scatter)
+
+
+def frame_stride(num_frames, interval_ms, draw_seconds):
+    """Frames to advance per tick: decimate long runs and skip frames when drawing can't keep up."""
+    stride = -(-num_frames // MAX_DISPLAY_FRAMES)
+    behind = draw_seconds * 1000.0 / interval_ms
+    return max(1, stride, int(np.ceil(behind)))
@@ -0,0 +1,96 @@
+import zipfile
+
+import numpy as np
+
+# Streaming trajectory files: blocks of states are appended while the integration runs, so a long
+# run never needs its whole solution in memory.
+#
+# .npz: a zip archive (deflate-compressed) holding masses.npy plus time_<k>.npy,
+#       positions_<k>.npy and velocities_<k>.npy for every appended block k; np.load() opens it.
+# .h5:  HDF5 file with growable gzip-compressed datasets time (T,), positions (T, n, dim),
+#       velocities (T, n, dim) and masses (n,). Needs h5py.
+
+H5_SUFFIXES = (".h5", ".hdf5")
+
+
+class TrajectoryWriter:
+    """Append (times, states) blocks for n bodies to a compressed .npz or .h5 file."""
+
+    def __init__(self, path, masses, dim):
+        self.path = path
+        self.masses = np.asarray(masses, dtype=float)
+        self.n = len(self.masses)
+        self.dim = dim
+        self.blocks = 0
+        self.frames = 0
+        if path.lower().endswith(H5_SUFFIXES):
+            try:
+                import h5py
+            except ImportError:
+                raise ImportError("h5py library not installed. Install with: pip install h5py (or save as .npz)")
+            self._h5 = h5py.File(path, "w")
+            self._h5.create_dataset("masses", data=self.masses)
+            self._h5.create_dataset("time", shape=(0,), maxshape=(None,), dtype=float, chunks=True, compression="gzip")
+            for name in ("positions", "velocities"):
+                self._h5.create_dataset(name, shape=(0, self.n, dim), maxshape=(None, self.n, dim), dtype=float,
+                                        chunks=True, compression="gzip")
+            self._zip = None
+        else:
+            self._h5 = None
+            self._zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True)
+            self._write_npy("masses", self.masses)
+
+    def _write_npy(self, name, array):
+        with self._zip.open(name + ".npy", "w", force_zip64=True) as f:
+            np.lib.format.write_array(f, np.ascontiguousarray(array), allow_pickle=False)
+
+    def append(self, times, states):
+        """Add states (k, 2 * dim * n) at times (k,)."""
+        states = np.asarray(states, dtype=float)
+        k = len(states)
+        if k == 0:
+            return
+        positions = states[:, :self.dim*self.n].reshape(k, self.n, self.dim)
+        velocities = states[:, self.dim*self.n:].reshape(k, self.n, self.dim)
+        if self._h5 is not None:
+            for name, block in (("time", np.asarray(times, dtype=float)), ("positions", positions),
+                                ("velocities", velocities)):
+                dataset = self._h5[name]
+                dataset.resize(self.frames + k, axis=0)
+                dataset[self.frames:] = block
+        else:
+            suffix = f"_{self.blocks:06d}"
+            self._write_npy("time" + suffix, np.asarray(times, dtype=float))
+            self._write_npy("positions" + suffix, positions)
+            self._write_npy("velocities" + suffix, velocities)
+        self.blocks += 1
+        self.frames += k
+
+    def close(self):
+        if self._h5 is not None:
+            self._h5.close()
+            self._h5 = None
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_trajectory(path):
+    """Load a file written by TrajectoryWriter into a dict of time, positions, velocities and masses."""
+    if path.lower().endswith(H5_SUFFIXES):
+        import h5py
+        with h5py.File(path, "r") as f:
+            return {name: f[name][...] for name in ("time", "positions", "velocities", "masses")}
+    with np.load(path) as data:
+        result = {"masses": data["masses"]}
+        for name in ("time", "positions", "velocities"):
+            keys = sorted(key for key in data.files if key.startswith(name + "_"))
+            result[name] = np.concatenate([data[key] for key in keys]) if keys else np.empty(0)
+    return result
+